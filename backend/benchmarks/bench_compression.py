@@ -0,0 +1,109 @@
+"""Measure CPU cost against bytes saved for response compression.
+
+Usage:
+    python benchmarks/bench_compression.py --products 100 --rounds 50
+
+Compresses a catalog page (the /products response shape) with each codec
+and level, then compares compressing on every request with serving a
+variant compressed once and kept in the response cache.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from middleware.compression import brotli, compress  # noqa: E402
+
+WORDS = [
+    "silk", "saree", "kanjeevaram", "banarasi", "cotton", "kurta", "handloom",
+    "basmati", "rice", "turmeric", "organic", "cardamom", "masala", "ghee",
+    "brass", "diya", "copper", "traditional", "jute", "pashmina", "shawl",
+    "ayurvedic", "neem", "sandalwood", "incense", "darjeeling", "tea",
+    "block", "print", "madhubani", "painting", "terracotta", "authentic",
+]
+CATEGORIES = ["Clothing", "Food & Grocery", "Health & Wellness", "Home & Decor"]
+
+
+def make_page(count: int, rng: random.Random) -> bytes:
+    products = []
+    for i in range(1, count + 1):
+        products.append({
+            "name": " ".join(rng.sample(WORDS, 3)).title(),
+            "description": " ".join(rng.choice(WORDS) for _ in range(40)).capitalize() + ".",
+            "price": round(rng.uniform(99, 25000), 2),
+            "category": rng.choice(CATEGORIES),
+            "image_url": f"https://images.unsplash.com/photo-{rng.randrange(10**12, 10**13)}?w=400",
+            "stock": rng.randrange(500),
+            "id": i,
+            "rating": round(rng.uniform(3, 5), 1),
+            "reviews_count": rng.randrange(1000),
+            "is_active": True,
+            "created_at": "2026-10-01T12:00:00",
+            "updated_at": None,
+        })
+    return json.dumps(products).encode()
+
+
+def timed(fn, rounds: int) -> float:
+    """Median seconds per call"""
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=1000, help="requests in the per-request vs cached comparison")
+    args = parser.parse_args()
+
+    body = make_page(args.products, random.Random(42))
+    print(f"catalog page: {args.products} products, {len(body) / 1024:.1f} KiB uncompressed")
+
+    codecs = [("gzip", level) for level in (1, 6, 9)]
+    if brotli is not None:
+        codecs += [("br", quality) for quality in (1, 4, 9, 11)]
+    else:
+        print("brotli not installed; showing gzip only")
+
+    print(f"{'codec':<8} {'level':>5} {'size KiB':>9} {'ratio':>6} {'saved KiB':>10} {'ms/resp':>8} {'KiB saved/ms':>13}")
+    for encoding, level in codecs:
+        compressed = compress(body, encoding, level)
+        seconds = timed(lambda: compress(body, encoding, level), args.rounds)
+        saved = (len(body) - len(compressed)) / 1024
+        print(f"{encoding:<8} {level:>5} {len(compressed) / 1024:>9.1f} {len(body) / len(compressed):>6.1f} "
+              f"{saved:>10.1f} {seconds * 1000:>8.3f} {saved / (seconds * 1000):>13.1f}")
+
+    # Per-request compression at the middleware default vs a cached variant
+    encoding, per_request_level, cached_level = ("br", 4, 9) if brotli is not None else ("gzip", 6, 9)
+    per_request = timed(lambda: compress(body, encoding, per_request_level), args.rounds) * args.requests
+    variants = {}
+
+    def serve_cached():
+        variant = variants.get(encoding)
+        if variant is None:
+            variant = variants[encoding] = compress(body, encoding, cached_level)
+        return variant
+
+    start = time.perf_counter()
+    for _ in range(args.requests):
+        serve_cached()
+    cached = time.perf_counter() - start
+    print(f"\n{args.requests} requests for the same page ({encoding}):")
+    print(f"  compress per request (level {per_request_level}): {per_request * 1000:9.1f} ms CPU, "
+          f"{len(compress(body, encoding, per_request_level)) / 1024:.1f} KiB each")
+    print(f"  cached variant (level {cached_level}, once):      {cached * 1000:9.1f} ms CPU, "
+          f"{len(variants[encoding]) / 1024:.1f} KiB each")
+
+
+if __name__ == "__main__":
+    main()
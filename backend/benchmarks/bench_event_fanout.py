@@ -0,0 +1,113 @@
+"""Measure live update fan-out to thousands of concurrent subscribers.
+
+Usage:
+    python benchmarks/bench_event_fanout.py --subscribers 5000 --budget-ms 250
+
+Each subscriber watches one hot product and a few random ones and drains its
+mailbox in its own task, as an SSE stream would. A fraction of subscribers
+never read, to show that coalescing keeps their backlog bounded. Exits
+non-zero when p95 publish-to-delivery latency exceeds --budget-ms.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.event_hub import EventHub  # noqa: E402
+from services.event_service import product_topic  # noqa: E402
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def consume(subscription, latencies, coalesce):
+    while not subscription.closed:
+        events = await subscription.get(timeout=1.0, coalesce=coalesce)
+        now = time.perf_counter()
+        latencies.extend(now - event.published_at for event in events)
+
+
+async def run(args):
+    rng = random.Random(42)
+    hub = EventHub(max_subscribers=args.subscribers, max_pending=args.max_pending)
+    await hub.start()
+
+    start = time.perf_counter()
+    subscriptions = []
+    for _ in range(args.subscribers):
+        watched = {0} | {rng.randrange(1, args.products) for _ in range(args.watch)}
+        subscriptions.append(hub.subscribe(product_topic(product_id) for product_id in watched))
+    print(f"subscribe: {(time.perf_counter() - start) * 1000:.1f} ms for {args.subscribers} subscribers")
+
+    slow = int(args.subscribers * args.slow_fraction)
+    latencies = []
+    consumers = [
+        asyncio.create_task(consume(subscription, latencies, args.coalesce_ms / 1000))
+        for subscription in subscriptions[slow:]
+    ]
+    await asyncio.sleep(0)
+
+    publish_time = 0.0
+    published = 0
+    for _ in range(args.rounds):
+        start = time.perf_counter()
+        # A burst: the hot product changes several times, plus random products
+        for stock in range(args.burst):
+            hub.publish([product_topic(0)], product_topic(0), "product", {"product_id": 0, "stock": stock})
+        for _ in range(args.burst):
+            product_id = rng.randrange(1, args.products)
+            topic = product_topic(product_id)
+            hub.publish([topic], topic, "product", {"product_id": product_id, "stock": 1})
+        publish_time += time.perf_counter() - start
+        published += 2 * args.burst
+        await asyncio.sleep(args.interval_ms / 1000)
+
+    await asyncio.sleep(args.coalesce_ms / 1000 + 0.1)
+    # Coalescing bounds an idle subscriber's mailbox by the keys it watches
+    slow_backlog = max((len(s._pending) for s in subscriptions[:slow]), default=0)
+    await hub.stop()
+    await asyncio.gather(*consumers)
+
+    stats = hub.get_stats()
+    print(f"publish: {published} events in {publish_time * 1000:.1f} ms "
+          f"({publish_time / published * 1e6:.1f} us/event incl. fan-out)")
+    print(f"fan-out: {stats['delivered']} queued, {stats['coalesced']} coalesced, "
+          f"{len(latencies)} delivered")
+    print(f"slow subscribers: {slow} never read, largest backlog {slow_backlog} events, "
+          f"{stats['dropped']} dropped")
+    if not latencies:
+        print("FAIL: nothing delivered")
+        sys.exit(1)
+    p95 = percentile(latencies, 0.95) * 1000
+    print(f"delivery latency: p50 {statistics.median(latencies) * 1000:.2f} ms, "
+          f"p95 {p95:.2f} ms, p99 {percentile(latencies, 0.99) * 1000:.2f} ms")
+
+    if args.budget_ms is not None and p95 > args.budget_ms:
+        print(f"FAIL: p95 {p95:.2f} ms exceeds budget {args.budget_ms} ms")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--subscribers", type=int, default=5000)
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--watch", type=int, default=5, help="random products per subscriber")
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--burst", type=int, default=20, help="events per product kind per round")
+    parser.add_argument("--interval-ms", type=float, default=20)
+    parser.add_argument("--coalesce-ms", type=float, default=50)
+    parser.add_argument("--max-pending", type=int, default=64)
+    parser.add_argument("--slow-fraction", type=float, default=0.02)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Measure fuzzy search latency over a synthetic catalog.
+
+Usage:
+    python benchmarks/bench_fuzzy_search.py --products 100000 --budget-ms 50
+
+Exits non-zero when p95 latency exceeds --budget-ms.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import in_memory_storage  # noqa: E402
+from services.search_service import SearchService  # noqa: E402
+
+WORDS = [
+    "silk", "saree", "kanjeevaram", "banarasi", "cotton", "kurta", "dupatta",
+    "basmati", "rice", "turmeric", "cumin", "cardamom", "masala", "ghee",
+    "brass", "diya", "copper", "bottle", "jute", "bag", "pashmina", "shawl",
+    "ayurvedic", "neem", "soap", "sandalwood", "incense", "darjeeling", "tea",
+    "handloom", "block", "print", "madhubani", "painting", "terracotta", "pot",
+]
+CATEGORIES = ["Clothing", "Food & Grocery", "Health & Wellness", "Home & Decor"]
+QUERIES = [
+    "kanjivaram", "kancheepuram saree", "haldi", "basmathi rice", "elaichi",
+    "pashmeena shawl", "madhubni painting", "darjiling tea", "sandalwod soap",
+    "terakotta pot", "banarsi silk", "jeera", "brass deepam", "handlom kurta",
+]
+
+
+def make_catalog(count: int, rng: random.Random):
+    for i in range(1, count + 1):
+        name = " ".join(rng.sample(WORDS, 3)).title()
+        # A unique-ish token per product keeps the vocabulary realistic in size
+        in_memory_storage["products"][i] = {
+            "id": i,
+            "name": f"{name} {rng.choice(WORDS)[:4]}{i % 5000}",
+            "description": " ".join(rng.sample(WORDS, 6)),
+            "category": rng.choice(CATEGORIES),
+        }
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    make_catalog(args.products, rng)
+
+    start = time.perf_counter()
+    SearchService.rebuild()
+    print(f"index build: {time.perf_counter() - start:.2f}s for {args.products} products")
+
+    latencies = []
+    hits = {}
+    for _ in range(args.rounds):
+        for query in QUERIES:
+            start = time.perf_counter()
+            hits[query] = len(SearchService.search(query))
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    # Baseline: the exact substring scan used by non-fuzzy search
+    scan = []
+    for query in QUERIES:
+        start = time.perf_counter()
+        needle = query.lower()
+        [p for p in in_memory_storage["products"].values()
+         if needle in p["name"].lower() or needle in p["description"].lower()]
+        scan.append((time.perf_counter() - start) * 1000)
+
+    p95 = percentile(latencies, 0.95)
+    print(f"fuzzy search: p50 {statistics.median(latencies):.2f} ms, "
+          f"p95 {p95:.2f} ms, p99 {percentile(latencies, 0.99):.2f} ms")
+    print(f"substring scan baseline: p50 {statistics.median(scan):.2f} ms")
+    for query, count in hits.items():
+        print(f"  {query!r}: {count} results")
+
+    if args.budget_ms is not None and p95 > args.budget_ms:
+        print(f"FAIL: p95 {p95:.2f} ms exceeds budget {args.budget_ms} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
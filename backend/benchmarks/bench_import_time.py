@@ -0,0 +1,61 @@
+"""Measure cold import time of the API module in a fresh interpreter.
+
+Usage:
+    python benchmarks/bench_import_time.py --runs 5 --budget-ms 1500
+
+Exits non-zero when the median import time exceeds --budget-ms, so it can
+run as a CI step.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_once(module: str) -> dict:
+    """Return {module_name: cumulative_us} from `python -X importtime`"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = int(cumulative)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="heaviest top-level imports to list")
+    parser.add_argument("--budget-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    runs = [import_once(args.module) for _ in range(args.runs)]
+    totals_ms = [run[args.module] / 1000 for run in runs]
+    median_ms = statistics.median(totals_ms)
+
+    print(f"import {args.module}: median {median_ms:.1f} ms "
+          f"(min {min(totals_ms):.1f}, max {max(totals_ms):.1f}, runs {args.runs})")
+    print("heaviest imports (cumulative, last run):")
+    last = sorted(runs[-1].items(), key=lambda kv: kv[1], reverse=True)
+    for name, cumulative_us in [kv for kv in last if kv[0] != args.module][:args.top]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+
+    if args.budget_ms is not None and median_ms > args.budget_ms:
+        print(f"FAIL: median import time {median_ms:.1f} ms exceeds budget {args.budget_ms} ms")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Measure startup time and full-GC pauses with and without the startup GC freeze.
+
+Usage:
+    python benchmarks/bench_startup.py --products 100000 --orders 300000
+
+Writes a persisted dataset once, then starts the API in a fresh interpreter
+per mode: load, every warm-up step, and a full collection afterwards (the
+pause a long-running worker pays whenever the GC reaches generation 2).
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from config import settings  # noqa: E402
+from database import in_memory_storage  # noqa: E402
+from services.persistence_service import PersistenceService  # noqa: E402
+
+WORDS = [
+    "silk", "saree", "kanjeevaram", "banarasi", "cotton", "kurta", "dupatta",
+    "basmati", "rice", "turmeric", "cumin", "cardamom", "masala", "ghee",
+    "brass", "diya", "copper", "bottle", "jute", "bag", "pashmina", "shawl",
+    "ayurvedic", "neem", "soap", "sandalwood", "incense", "darjeeling", "tea",
+]
+CATEGORIES = ["Clothing", "Food & Grocery", "Health & Wellness", "Home & Decor"]
+
+STARTUP_SCRIPT = """
+import asyncio, gc, json, time
+import main
+from services.lifecycle_service import LifecycleService
+
+asyncio.run(LifecycleService.startup())
+start = time.perf_counter()
+gc.collect()
+full_gc_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({**LifecycleService.get_status()["timings_ms"], "full_gc": round(full_gc_ms, 2)}))
+"""
+
+
+def write_dataset(data_dir: str, products: int, orders: int):
+    rng = random.Random(42)
+    settings.persistence_enabled = True
+    settings.data_dir = data_dir
+    in_memory_storage["products"].replace_all({
+        i: {
+            "id": i,
+            "name": f"{' '.join(rng.sample(WORDS, 3)).title()} {i % 5000}",
+            "description": " ".join(rng.sample(WORDS, 8)),
+            "price": round(rng.uniform(99, 25000), 2),
+            "category": rng.choice(CATEGORIES),
+            "image_url": f"https://example.com/images/{i}.jpg",
+            "stock": rng.randrange(500),
+            "rating": round(rng.uniform(3, 5), 1),
+            "reviews_count": rng.randrange(1000),
+            "is_active": True,
+            "created_at": "2026-01-01T00:00:00",
+        }
+        for i in range(1, products + 1)
+    })
+    start = datetime(2026, 1, 1)
+    for i in range(1, orders + 1):
+        basket = rng.sample(range(1, products + 1), 1 + i % 3)
+        in_memory_storage["orders"][i] = {
+            "id": i,
+            "user_id": i % 10000 + 1,
+            "items": [
+                {"product_id": product_id, "quantity": 1, "unit_price": 450.0, "category": "Clothing"}
+                for product_id in basket
+            ],
+            "total_amount": 450.0 * len(basket),
+            "status": "confirmed",
+            "shipping_address": "12 MG Road, Bengaluru",
+            "created_at": start + timedelta(seconds=i * 30),
+        }
+    PersistenceService.close()
+
+
+def start_once(data_dir: str, gc_freeze: bool) -> dict:
+    env = {
+        **os.environ,
+        "PERSISTENCE_ENABLED": "true",
+        "DATA_DIR": data_dir,
+        "STARTUP_GC_FREEZE": "true" if gc_freeze else "false",
+    }
+    result = subprocess.run(
+        [sys.executable, "-c", STARTUP_SCRIPT],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--products", type=int, default=100_000)
+    parser.add_argument("--orders", type=int, default=300_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_dataset(data_dir, args.products, args.orders)
+        results = {
+            "gc running": start_once(data_dir, gc_freeze=False),
+            "gc frozen": start_once(data_dir, gc_freeze=True),
+        }
+
+    phases = list(results["gc running"])
+    print(f"{'phase (ms)':<28}" + "".join(f"{mode:>14}" for mode in results))
+    for phase in phases:
+        print(f"{phase:<28}" + "".join(f"{timings.get(phase, 0):>14.1f}" for timings in results.values()))
+
+
+if __name__ == "__main__":
+    main()
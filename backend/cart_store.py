@@ -0,0 +1,262 @@
+# Memory-bounded cart storage
+#
+# Carts are kept in memory in least-recently-touched order. Carts idle past
+# the spill age, or the oldest ones whenever the memory budget is exceeded,
+# are written to one small file each under the spill directory and loaded
+# back transparently on next access. Carts idle past the TTL are dropped.
+
+import os
+import pickle
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Dict, Iterator, List, Optional, Tuple
+
+
+class _Cart:
+    __slots__ = ("items", "touched", "size")
+
+    def __init__(self, items: List[dict], touched: float, size: int):
+        self.items = items
+        self.touched = touched
+        self.size = size
+
+
+class CartSnapshot:
+    """Point-in-time view of a CartStore for background snapshots.
+
+    Taking it costs one pass over the in-memory indexes; spilled carts are
+    only listed, and their files are read when the view is iterated, which
+    the persistence service does from a worker thread.
+    """
+
+    def __init__(self, store: "CartStore", resident: Dict[int, List[dict]], spilled: List[int]):
+        self._store = store
+        self._resident = resident
+        self._spilled = spilled
+
+    def __len__(self) -> int:
+        return len(self._resident) + len(self._spilled)
+
+    def items(self) -> Iterator[Tuple[int, List[dict]]]:
+        yield from self._resident.items()
+        for user_id in self._spilled:
+            items = self._store._peek(user_id)
+            # None: deleted since the view was taken, which the log records
+            if items is not None:
+                yield user_id, items
+
+
+class CartStore(MutableMapping):
+    """user_id -> list of cart items, with last-touched tracking and LRU spill.
+
+    Reads and writes count as a touch. Empty carts are not stored: assigning
+    an empty list deletes the cart. `items()` walks spilled carts without
+    loading them back into memory, so snapshots don't defeat the budget.
+    """
+
+    def __init__(self, spill_dir: str, memory_budget: int):
+        self.spill_dir = spill_dir
+        self.memory_budget = memory_budget
+        self._resident: "OrderedDict[int, _Cart]" = OrderedDict()
+        self._spilled: "OrderedDict[int, float]" = OrderedDict()  # user_id -> touched, oldest first
+        self._resident_bytes = 0
+        self._spill_dir_ready = False
+        self.spills = 0
+        self.restores = 0
+        self.expired = 0
+
+    # Spill files
+
+    def _path(self, user_id: int) -> str:
+        return os.path.join(self.spill_dir, f"{user_id}.pkl")
+
+    def _write_spill(self, user_id: int, items: List[dict]):
+        if not self._spill_dir_ready:
+            # Files left by an earlier process aren't in this store's index
+            os.makedirs(self.spill_dir, exist_ok=True)
+            for name in os.listdir(self.spill_dir):
+                if name.endswith(".pkl"):
+                    os.remove(os.path.join(self.spill_dir, name))
+            self._spill_dir_ready = True
+        path = self._path(user_id)
+        with open(path + ".tmp", "wb") as f:
+            pickle.dump(items, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + ".tmp", path)
+
+    def _read_spill(self, user_id: int) -> List[dict]:
+        with open(self._path(user_id), "rb") as f:
+            return pickle.load(f)
+
+    def _remove_spill(self, user_id: int):
+        try:
+            os.remove(self._path(user_id))
+        except FileNotFoundError:
+            pass
+
+    # Resident set
+
+    def _spill(self, user_id: int):
+        # File first, so a snapshot reading from another thread always finds
+        # the cart in memory or on disk
+        cart = self._resident[user_id]
+        self._write_spill(user_id, cart.items)
+        self._spilled[user_id] = cart.touched
+        del self._resident[user_id]
+        self._resident_bytes -= cart.size
+        self.spills += 1
+
+    def _peek(self, user_id: int) -> Optional[List[dict]]:
+        """A cart's items without touching or restoring it; safe off the loop"""
+        for _ in range(2):
+            try:
+                return self._read_spill(user_id)
+            except FileNotFoundError:
+                pass
+            # Restored since it was listed, or spilled again right after
+            cart = self._resident.get(user_id)
+            if cart is not None:
+                return cart.items
+        return None
+
+    def _enforce_budget(self, keep: int):
+        while self._resident_bytes > self.memory_budget and len(self._resident) > 1:
+            user_id = next(iter(self._resident))
+            if user_id == keep:
+                self._resident.move_to_end(user_id)
+                continue
+            self._spill(user_id)
+
+    def _store(self, user_id: int, items: List[dict], touched: float):
+        size = len(pickle.dumps(items, protocol=pickle.HIGHEST_PROTOCOL))
+        old = self._resident.pop(user_id, None)
+        if old is not None:
+            self._resident_bytes -= old.size
+        self._resident[user_id] = _Cart(items, touched, size)
+        self._resident_bytes += size
+        self._enforce_budget(keep=user_id)
+
+    # Mapping interface
+
+    def __getitem__(self, user_id: int) -> List[dict]:
+        now = time.time()
+        cart = self._resident.get(user_id)
+        if cart is not None:
+            cart.touched = now
+            self._resident.move_to_end(user_id)
+            return cart.items
+        if user_id not in self._spilled:
+            raise KeyError(user_id)
+        items = self._read_spill(user_id)
+        del self._spilled[user_id]
+        self._store(user_id, items, now)
+        self._remove_spill(user_id)
+        self.restores += 1
+        return items
+
+    def __setitem__(self, user_id: int, items: List[dict]):
+        if not items:
+            if user_id in self:
+                del self[user_id]
+            return
+        if self._spilled.pop(user_id, None) is not None:
+            self._remove_spill(user_id)
+        self._store(user_id, items, time.time())
+
+    def __delitem__(self, user_id: int):
+        cart = self._resident.pop(user_id, None)
+        if cart is not None:
+            self._resident_bytes -= cart.size
+        elif self._spilled.pop(user_id, None) is not None:
+            self._remove_spill(user_id)
+        else:
+            raise KeyError(user_id)
+
+    def __contains__(self, user_id: object) -> bool:
+        return user_id in self._resident or user_id in self._spilled
+
+    def __iter__(self) -> Iterator[int]:
+        yield from list(self._resident)
+        yield from list(self._spilled)
+
+    def __len__(self) -> int:
+        return len(self._resident) + len(self._spilled)
+
+    def items(self) -> Iterator[Tuple[int, List[dict]]]:
+        for user_id, cart in list(self._resident.items()):
+            yield user_id, cart.items
+        for user_id in list(self._spilled):
+            yield user_id, self._read_spill(user_id)
+
+    def snapshot_view(self) -> CartSnapshot:
+        """A view for snapshots that leaves reading spilled carts to the caller's thread"""
+        return CartSnapshot(
+            self,
+            {user_id: cart.items for user_id, cart in self._resident.items()},
+            list(self._spilled),
+        )
+
+    def values(self) -> Iterator[List[dict]]:
+        return (items for _, items in self.items())
+
+    def clear(self):
+        for user_id in self._spilled:
+            self._remove_spill(user_id)
+        self._resident.clear()
+        self._spilled.clear()
+        self._resident_bytes = 0
+
+    def replace_all(self, carts: Dict[int, List[dict]]):
+        """Install a whole set of carts, e.g. after loading persisted state"""
+        self.clear()
+        now = time.time()
+        for user_id, items in carts.items():
+            if items:
+                self._store(user_id, items, now)
+
+    # Expiry
+
+    def sweep(self, spill_after: float, ttl: float, limit: Optional[int] = None) -> Tuple[int, List[int]]:
+        """Spill carts idle longer than `spill_after` seconds and drop those idle past `ttl`.
+
+        Handles at most `limit` carts per call. Returns how many carts were
+        handled and the user ids of the dropped ones.
+        """
+        now = time.time()
+        limit = limit if limit is not None else len(self)
+        budget = limit
+        expired = []
+        # Both orders are oldest-touched first, so stop at the first fresh cart
+        while self._spilled and budget > 0:
+            user_id, touched = next(iter(self._spilled.items()))
+            if now - touched < ttl:
+                break
+            del self._spilled[user_id]
+            self._remove_spill(user_id)
+            expired.append(user_id)
+            budget -= 1
+        while self._resident and budget > 0:
+            user_id, cart = next(iter(self._resident.items()))
+            idle = now - cart.touched
+            if idle < spill_after:
+                break
+            if idle >= ttl:
+                del self[user_id]
+                expired.append(user_id)
+            else:
+                self._spill(user_id)
+            budget -= 1
+        self.expired += len(expired)
+        return limit - budget, expired
+
+    def get_stats(self) -> dict:
+        """Resident and spilled cart counts and memory use"""
+        return {
+            "resident_carts": len(self._resident),
+            "resident_bytes": self._resident_bytes,
+            "memory_budget_bytes": self.memory_budget,
+            "spilled_carts": len(self._spilled),
+            "spills": self.spills,
+            "restores": self.restores,
+            "expired": self.expired,
+        }
@@ -0,0 +1,173 @@
+# Versioned, copy-on-write product catalog
+#
+# Readers grab the current CatalogSnapshot with a single attribute read and
+# never take a lock; nothing reachable from a published snapshot is ever
+# mutated. Writers build the next snapshot and swap it in atomically.
+
+import math
+import threading
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, Optional
+
+_DELETED = object()
+
+
+class FrozenProduct(dict):
+    """A product dict that can't be modified once published.
+
+    Use `product.copy()` to get a mutable dict for building the next version.
+    """
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Published products are immutable; copy() and write back instead")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    update = pop = popitem = clear = setdefault = _readonly
+
+    def __reduce__(self):
+        return FrozenProduct, (dict(self),)
+
+
+def freeze(product: dict) -> FrozenProduct:
+    if isinstance(product, FrozenProduct):
+        return product
+    return FrozenProduct(product)
+
+
+class CatalogSnapshot:
+    """An immutable view of the catalog at one version.
+
+    Stored as a large base dict plus a small overlay of changes since the base
+    was built, so a write copies only the overlay rather than the whole catalog.
+    """
+    __slots__ = ("version", "_base", "_overlay", "_size")
+
+    def __init__(self, version: int, base: Dict[int, FrozenProduct], overlay: Dict[int, Any]):
+        self.version = version
+        self._base = base
+        self._overlay = overlay
+        size = len(base)
+        for product_id, product in overlay.items():
+            in_base = product_id in base
+            if product is _DELETED:
+                size -= in_base
+            elif not in_base:
+                size += 1
+        self._size = size
+
+    def get(self, product_id: int, default: Optional[FrozenProduct] = None) -> Optional[FrozenProduct]:
+        product = self._overlay.get(product_id, self._base.get(product_id, default))
+        return default if product is _DELETED else product
+
+    def __contains__(self, product_id: int) -> bool:
+        return self.get(product_id) is not None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def items(self) -> Iterator:
+        overlay = self._overlay
+        for product_id, product in self._base.items():
+            if product_id in overlay:
+                product = overlay[product_id]
+                if product is _DELETED:
+                    continue
+            yield product_id, product
+        for product_id, product in overlay.items():
+            if product is not _DELETED and product_id not in self._base:
+                yield product_id, product
+
+    def keys(self) -> Iterator[int]:
+        return (product_id for product_id, _ in self.items())
+
+    __iter__ = keys
+
+    def values(self) -> Iterator[FrozenProduct]:
+        return (product for _, product in self.items())
+
+
+class CatalogStore(MutableMapping):
+    """Product storage that publishes a new CatalogSnapshot on every write.
+
+    Behaves like the other `in_memory_storage` dicts (reads go to the current
+    snapshot), and adds `current()` for a consistent multi-read view and
+    `publish()` for applying several changes as one version.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = CatalogSnapshot(0, {}, {})
+
+    def current(self) -> CatalogSnapshot:
+        """The latest published snapshot"""
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version
+
+    def publish(self, changes: Dict[int, Optional[dict]]) -> CatalogSnapshot:
+        """Apply {product_id: product or None to delete} as one new version"""
+        with self._lock:
+            current = self._snapshot
+            overlay = dict(current._overlay)
+            for product_id, product in changes.items():
+                overlay[product_id] = _DELETED if product is None else freeze(product)
+
+            base = current._base
+            # Fold the overlay into a fresh base once it outgrows sqrt(n); this
+            # keeps both the per-write overlay copy and amortized compaction
+            # at O(sqrt(n)).
+            if len(overlay) > max(64, math.isqrt(len(base))):
+                base = dict(CatalogSnapshot(current.version, base, overlay).items())
+                overlay = {}
+
+            self._snapshot = CatalogSnapshot(current.version + 1, base, overlay)
+            return self._snapshot
+
+    def replace_all(self, products: Dict[int, dict]) -> CatalogSnapshot:
+        """Publish a whole new catalog as one version"""
+        with self._lock:
+            base = {product_id: freeze(product) for product_id, product in products.items()}
+            self._snapshot = CatalogSnapshot(self._snapshot.version + 1, base, {})
+            return self._snapshot
+
+    def __getitem__(self, product_id: int) -> FrozenProduct:
+        product = self._snapshot.get(product_id)
+        if product is None:
+            raise KeyError(product_id)
+        return product
+
+    def get(self, product_id: int, default: Optional[FrozenProduct] = None) -> Optional[FrozenProduct]:
+        return self._snapshot.get(product_id, default)
+
+    def __contains__(self, product_id: object) -> bool:
+        return product_id in self._snapshot
+
+    def __setitem__(self, product_id: int, product: dict):
+        self.publish({product_id: product})
+
+    def __delitem__(self, product_id: int):
+        if product_id not in self._snapshot:
+            raise KeyError(product_id)
+        self.publish({product_id: None})
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._snapshot)
+
+    def __len__(self) -> int:
+        return len(self._snapshot)
+
+    def values(self):
+        return self._snapshot.values()
+
+    def items(self):
+        return self._snapshot.items()
+
+    def clear(self):
+        self.replace_all({})
+
+    def update(self, other=(), **kwargs):
+        changes = dict(other, **kwargs)
+        if changes:
+            self.publish(changes)
@@ -1,5 +1,5 @@
 import os
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseSettings
 
 
@@ -13,6 +13,7 @@ class Settings(BaseSettings):
     secret_key: str = "tattvam-secret-key-2024"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 1440  # 24 hours
+    admin_user_ids: List[int] = []  # users allowed on /admin, e.g. ADMIN_USER_IDS=[1]
     
     # Database settings (for future use)
     database_url: Optional[str] = None
@@ -28,6 +29,81 @@ class Settings(BaseSettings):
     # API settings
     api_v1_prefix: str = "/api/v1"
     
+    # Persistence settings (snapshot + append-only mutation log)
+    persistence_enabled: bool = False
+    data_dir: str = "data"
+    snapshot_every: int = 100000  # log records between snapshots
+    persistence_fsync: bool = False
+    
+    # Startup settings
+    startup_gc_freeze: bool = True  # pause the cyclic GC while loading, then freeze what was loaded
+    
+    # Order pipeline settings
+    order_workers: int = 4
+    order_queue_size: int = 10000
+    order_job_retries: int = 3
+    
+    # Recommendation settings
+    recommendation_neighbors: int = 12  # precomputed related products per product
+    recommendation_row_cap: int = 200  # co-occurrence entries kept per product
+    recommendation_max_basket: int = 50
+    
+    # Typeahead settings
+    suggest_cache_size: int = 10  # top terms cached per trie node
+    suggest_query_min_count: int = 3  # searches before a query is suggested
+    suggest_max_queries: int = 50000
+    suggest_max_key_length: int = 16
+    suggest_cache_max_age: int = 300  # seconds
+    
+    # Fuzzy search settings
+    search_min_similarity: float = 0.5  # trigram Dice coefficient
+    search_max_token_matches: int = 20  # vocabulary matches kept per query word
+    search_max_results: int = 1000
+    search_synonyms_file: Optional[str] = None  # JSON list of synonym groups
+    
+    # Live update settings (server-sent events)
+    events_max_subscribers: int = 10000
+    events_max_per_client: int = 5  # open streams per user, or per address when anonymous
+    events_max_pending: int = 256  # distinct pending keys before a slow subscriber is dropped
+    events_coalesce_ms: int = 50
+    events_heartbeat_seconds: int = 15
+    events_max_products: int = 100  # product ids per subscription
+    
+    # Admission control settings (per-client rate limits, concurrency, load shedding)
+    admission_enabled: bool = True
+    rate_limit_read_per_second: float = 20.0
+    rate_limit_read_burst: int = 40
+    rate_limit_write_per_second: float = 5.0
+    rate_limit_write_burst: int = 10
+    rate_limit_checkout_per_second: float = 0.2
+    rate_limit_checkout_burst: int = 3
+    rate_limit_max_clients: int = 100000
+    # Peers (addresses or CIDR ranges) whose X-Real-IP header is believed, i.e.
+    # the nginx proxy; anyone else is keyed by their own address
+    trusted_proxies: List[str] = ["127.0.0.1"]
+    max_concurrent_requests: int = 64
+    admission_queue_target_ms: int = 50  # shed when queueing delay stays above this
+    admission_queue_interval_ms: int = 500
+    admission_max_queue: int = 1000
+    
+    # Cart store settings
+    cart_memory_budget_bytes: int = 64 * 1024 * 1024  # resident carts beyond this spill to disk
+    cart_spill_after_seconds: int = 3600  # idle carts are spilled after this
+    cart_ttl_seconds: int = 30 * 24 * 3600  # idle carts are dropped after this
+    cart_sweep_interval_seconds: int = 300
+    cart_sweep_batch: int = 1000
+    
+    # Compression settings
+    compression_min_size: int = 1024  # smaller responses go out uncompressed
+    compression_gzip_level: int = 6
+    compression_brotli_quality: int = 4
+    # Catalog response cache: variants are compressed once per catalog version,
+    # so they can afford higher levels than per-request compression
+    response_cache_entries: int = 1024
+    response_cache_max_body: int = 4 * 1024 * 1024
+    response_cache_gzip_level: int = 9
+    response_cache_brotli_quality: int = 9
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -1,10 +1,13 @@
 # Database configuration and connection setup
 # This file will be used when we integrate with a real database (PostgreSQL, etc.)
 
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+import os
 from config import settings
+from catalog import CatalogStore
+from cart_store import CartStore
+
+# SQLAlchemy is imported lazily (see __getattr__ below) so that services which
+# only need in_memory_storage don't pay its import cost at startup.
 
 # For now, we'll use in-memory storage
 # In the future, this will be replaced with actual database connection
@@ -15,7 +18,18 @@ from config import settings
 # For future database integration:
 # engine = create_engine(SQLALCHEMY_DATABASE_URL)
 # SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-Base = declarative_base()
+_base = None
+
+
+def __getattr__(name):
+    """Create the declarative Base on first access (`from database import Base`)"""
+    global _base
+    if name == "Base":
+        if _base is None:
+            from sqlalchemy.ext.declarative import declarative_base
+            _base = declarative_base()
+        return _base
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Dependency to get database session
 # def get_db():
@@ -29,7 +43,10 @@ Base = declarative_base()
 # This will be replaced with actual database operations
 in_memory_storage = {
     "users": {},
-    "products": {},
+    "products": CatalogStore(),  # copy-on-write, see catalog.py
     "orders": {},
-    "cart": {}
-}
\ No newline at end of file
+    "cart": CartStore(  # memory-bounded with expiry, see cart_store.py
+        spill_dir=os.path.join(settings.data_dir, "carts"),
+        memory_budget=settings.cart_memory_budget_bytes,
+    ),
+}
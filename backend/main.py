@@ -1,17 +1,67 @@
-from fastapi import FastAPI
+import time
+
+_import_started = time.perf_counter()
+
+from contextlib import asynccontextmanager
+
+from fastapi import Depends, FastAPI, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-import uvicorn
 
 from config import settings
-from routers import auth, products, cart, orders
+from routers import auth, products, cart, orders, admin, bootstrap, events
+from routers.admission import admit_cache_hit, admit_request
+from middleware.compression import CompressionMiddleware
+from middleware.response_cache import ResponseCache, ResponseCacheMiddleware
+from services.lifecycle_service import LifecycleService
+from services.persistence_service import PersistenceService
+from services.order_pipeline import OrderPipeline, order_queue
+from services.event_service import event_hub
+from services.admission_service import concurrency_limiter, rate_limiter
+from services.analytics_service import AnalyticsService
+from services.recommendation_service import RecommendationService
+from services.suggest_service import SuggestService
+from services.search_service import SearchService
+from services.cart_service import CartService
+from services.order_service import OrderService
 from services.product_service import ProductService
+from database import in_memory_storage
+
+LifecycleService.record_timing("import", time.perf_counter() - _import_started)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load data and warm caches before serving, flush state on exit"""
+    await LifecycleService.startup()
+    yield
+    await LifecycleService.shutdown()
+
 
 # Create FastAPI application
 app = FastAPI(
     title=settings.app_name,
     description="Indian E-commerce API for authentic products",
     version=settings.app_version,
-    debug=settings.debug
+    debug=settings.debug,
+    lifespan=lifespan
+)
+
+# Catalog response cache and compression; added before CORS so that CORS
+# stays outermost and also covers responses served from the cache
+catalog_response_cache = ResponseCache(
+    version=ProductService.get_catalog_version,
+    max_entries=settings.response_cache_entries,
+    max_body=settings.response_cache_max_body,
+    minimum_size=settings.compression_min_size,
+    gzip_level=settings.response_cache_gzip_level,
+    brotli_quality=settings.response_cache_brotli_quality,
+)
+app.add_middleware(ResponseCacheMiddleware, cache=catalog_response_cache, admit=admit_cache_hit)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.compression_min_size,
+    gzip_level=settings.compression_gzip_level,
+    brotli_quality=settings.compression_brotli_quality,
 )
 
 # CORS middleware
@@ -23,11 +73,31 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Include routers
-app.include_router(auth.router, prefix=settings.api_v1_prefix)
-app.include_router(products.router, prefix=settings.api_v1_prefix)
-app.include_router(cart.router, prefix=settings.api_v1_prefix)
-app.include_router(orders.router, prefix=settings.api_v1_prefix)
+# Include routers behind admission control (per-client rate limits, a
+# concurrency cap and load shedding); live update streams are long-lived and
+# exempt
+admission = [Depends(admit_request)]
+app.include_router(auth.router, prefix=settings.api_v1_prefix, dependencies=admission)
+app.include_router(products.router, prefix=settings.api_v1_prefix, dependencies=admission)
+app.include_router(cart.router, prefix=settings.api_v1_prefix, dependencies=admission)
+app.include_router(orders.router, prefix=settings.api_v1_prefix, dependencies=admission)
+app.include_router(admin.router, prefix=settings.api_v1_prefix, dependencies=admission)
+app.include_router(bootstrap.router, prefix=settings.api_v1_prefix, dependencies=admission)
+app.include_router(events.router, prefix=settings.api_v1_prefix)
+
+# Warm-up steps run after data is loaded and before the worker reports ready
+LifecycleService.register_warmup("order_index", OrderService.rebuild_index)
+LifecycleService.register_warmup("analytics", AnalyticsService.rebuild)
+LifecycleService.register_warmup("recommendations", RecommendationService.rebuild)
+LifecycleService.register_warmup("suggest", SuggestService.rebuild)
+LifecycleService.register_warmup("search", SearchService.rebuild)
+LifecycleService.register_warmup("openapi", app.openapi)
+# Jobs are not persisted; pick restored orders up where they stopped
+LifecycleService.register_warmup("order_pipeline", OrderPipeline.resume)
+LifecycleService.register_service("snapshotter", PersistenceService.start_snapshotter, PersistenceService.stop_snapshotter)
+LifecycleService.register_service("order_queue", order_queue.start, order_queue.stop)
+LifecycleService.register_service("event_hub", event_hub.start, event_hub.stop)
+LifecycleService.register_service("cart_sweeper", CartService.start_sweeper, CartService.stop_sweeper)
 
 # Root endpoint
 @app.get("/")
@@ -39,21 +109,44 @@ async def root():
         "api_prefix": settings.api_v1_prefix
     }
 
-# Health check endpoint
+# Health check endpoints
 @app.get("/health")
+@app.get("/health/live")
 async def health_check():
+    """Liveness: the process is up and serving the event loop"""
     return {"status": "healthy", "service": "tattvam-api"}
 
-# Initialize sample data
-@app.on_event("startup")
-async def startup_event():
-    """Initialize sample data on startup"""
-    ProductService.initialize_sample_products()
+
+@app.get("/health/ready")
+async def readiness_check(response: Response):
+    """Readiness: data is loaded and caches are warm"""
+    startup_status = LifecycleService.get_status()
+    if not startup_status["ready"]:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {"status": "ready" if startup_status["ready"] else "starting", **startup_status}
+
+
+@app.get("/metrics")
+async def metrics():
+    """In-process metrics for background work"""
+    return {
+        "order_queue": order_queue.get_stats(),
+        "recommendations": RecommendationService.get_stats(),
+        "events": event_hub.get_stats(),
+        "carts": in_memory_storage["cart"].get_stats(),
+        "response_cache": catalog_response_cache.get_stats(),
+        "admission": {
+            "concurrency": concurrency_limiter.get_stats(),
+            "rate_limits": rate_limiter.get_stats(),
+        },
+    }
 
 if __name__ == "__main__":
+    import uvicorn
+
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=8000,
         reload=settings.debug
-    )
\ No newline at end of file
+    )
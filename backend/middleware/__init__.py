@@ -0,0 +1 @@
+# ASGI middleware package
\ No newline at end of file
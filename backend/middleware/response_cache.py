@@ -0,0 +1,198 @@
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+from fastapi import Request, Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from middleware.compression import choose_encoding, compress
+
+# Set by a route to let its 200 response be cached until the catalog version
+# (reported in X-Catalog-Version) changes; stripped before sending
+CACHEABLE_HEADER = "x-catalog-cacheable"
+
+# Headers that differ per variant and are set when an entry is served
+_VARIANT_HEADERS = {b"content-length", b"content-encoding", b"vary", CACHEABLE_HEADER.encode()}
+
+
+def mark_cacheable(response: Response):
+    """Opt a catalog response into the shared response cache"""
+    response.headers[CACHEABLE_HEADER] = "1"
+
+
+class _Entry:
+    __slots__ = ("version", "headers", "etag", "body", "variants")
+
+    def __init__(self, version: int, headers: List[Tuple[bytes, bytes]], etag: Optional[str], body: bytes):
+        self.version = version
+        self.headers = headers
+        self.etag = etag
+        self.body = body
+        self.variants: Dict[str, bytes] = {}
+
+
+class ResponseCache:
+    """Serialized catalog responses and their compressed variants.
+
+    Entries are keyed by path and query string and tagged with the catalog
+    version they were rendered from; a version change makes them misses.
+    Each compressed variant is produced on first request for that encoding
+    and reused until the entry goes stale, so a hot page is compressed once
+    per catalog version instead of once per request.
+    """
+
+    def __init__(
+        self,
+        version: Callable[[], int],
+        max_entries: int = 1024,
+        max_body: int = 4 * 1024 * 1024,
+        minimum_size: int = 1024,
+        gzip_level: int = 9,
+        brotli_quality: int = 9,
+    ):
+        self.version = version
+        self.max_entries = max_entries
+        self.max_body = max_body
+        self.minimum_size = minimum_size
+        self.levels = {"gzip": gzip_level, "br": brotli_quality}
+        self._entries: "OrderedDict[Tuple[str, bytes], _Entry]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.compressions = 0
+
+    def get(self, key: Tuple[str, bytes]) -> Optional[_Entry]:
+        entry = self._entries.get(key)
+        if entry is None or entry.version != self.version():
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: Tuple[str, bytes], entry: _Entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def variant(self, entry: _Entry, encoding: Optional[str]) -> bytes:
+        if encoding is None:
+            return entry.body
+        body = entry.variants.get(encoding)
+        if body is None:
+            body = entry.variants[encoding] = compress(entry.body, encoding, self.levels[encoding])
+            self.compressions += 1
+        return body
+
+    def clear(self):
+        self._entries.clear()
+
+    def get_stats(self) -> dict:
+        """Entry count, hit rate and bytes held"""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "compressions": self.compressions,
+            "bytes": sum(
+                len(entry.body) + sum(len(body) for body in entry.variants.values())
+                for entry in self._entries.values()
+            ),
+        }
+
+
+class ResponseCacheMiddleware:
+    """Serve GET responses marked cacheable from a ResponseCache.
+
+    Hits are answered before routing, so route dependencies don't run for
+    them; `admit`, if given, is called first and may return a response (e.g.
+    a 429) to send instead of the cached entry.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        cache: ResponseCache,
+        admit: Optional[Callable[[Request], Optional[Response]]] = None,
+    ):
+        self.app = app
+        self.cache = cache
+        self.admit = admit
+
+    async def _send_entry(self, entry: _Entry, request_headers: Headers, send: Send):
+        if entry.etag is not None and request_headers.get("if-none-match") == entry.etag:
+            headers = [(name, value) for name, value in entry.headers if name in (b"etag", b"x-catalog-version")]
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        encoding = None
+        if len(entry.body) >= self.cache.minimum_size:
+            encoding = choose_encoding(request_headers.get("accept-encoding", ""))
+        body = self.cache.variant(entry, encoding)
+        headers = list(entry.headers)
+        headers.append((b"content-length", str(len(body)).encode()))
+        headers.append((b"vary", b"Accept-Encoding"))
+        if encoding is not None:
+            headers.append((b"content-encoding", encoding.encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        key = (scope["path"], scope["query_string"])
+        entry = self.cache.get(key)
+        if entry is not None:
+            if self.admit is not None:
+                rejection = self.admit(Request(scope))
+                if rejection is not None:
+                    await rejection(scope, receive, send)
+                    return
+            self.cache.hits += 1
+            await self._send_entry(entry, request_headers, send)
+            return
+        self.cache.misses += 1
+
+        start: Optional[Message] = None
+        chunks: List[bytes] = []
+        size = 0
+
+        async def capture(message: Message):
+            nonlocal start, size
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                if message["status"] == 200 and CACHEABLE_HEADER in headers and "x-catalog-version" in headers:
+                    start = message
+                    return
+                if CACHEABLE_HEADER in headers:
+                    del headers[CACHEABLE_HEADER]
+                await send(message)
+                return
+            if start is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            size += len(chunks[-1])
+            if message.get("more_body", False) and size <= self.cache.max_body:
+                return
+            if size > self.cache.max_body:
+                # Too big to keep: send what we have and stream the rest through
+                headers = MutableHeaders(raw=start["headers"])
+                del headers[CACHEABLE_HEADER]
+                await send(start)
+                await send({**message, "body": b"".join(chunks)})
+                start = None
+                return
+
+            response_headers = Headers(raw=start["headers"])
+            entry = _Entry(
+                version=int(response_headers["x-catalog-version"]),
+                headers=[(name, value) for name, value in start["headers"] if name not in _VARIANT_HEADERS],
+                etag=response_headers.get("etag"),
+                body=b"".join(chunks),
+            )
+            self.cache.put(key, entry)
+            await self._send_entry(entry, request_headers, send)
+
+        await self.app(scope, receive, capture)
@@ -0,0 +1,84 @@
+# Time index over orders
+#
+# Order ids are kept in one bucket per UTC day, each sorted by created_at.
+# Range scans touch only the days in range and bisect into the two boundary
+# days; newest-first listing walks the buckets backwards, so neither needs to
+# sort the order history.
+
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class _DayBucket:
+    __slots__ = ("times", "ids")
+
+    def __init__(self):
+        self.times: List[datetime] = []
+        self.ids: List[int] = []
+
+    def add(self, created_at: datetime, order_id: int):
+        # Orders normally arrive in time order, making this an append
+        position = bisect_right(self.times, created_at)
+        self.times.insert(position, created_at)
+        self.ids.insert(position, order_id)
+
+
+class OrderIndex:
+    """Order ids by creation time, in per-day buckets"""
+
+    def __init__(self):
+        self._buckets: Dict[date, _DayBucket] = {}
+        self._days: List[date] = []  # sorted keys of _buckets
+        self._size = 0
+
+    def add(self, order_id: int, created_at: datetime):
+        day = created_at.date()
+        bucket = self._buckets.get(day)
+        if bucket is None:
+            bucket = self._buckets[day] = _DayBucket()
+            insort(self._days, day)
+        bucket.add(created_at, order_id)
+        self._size += 1
+
+    def rebuild(self, orders: Iterable[Tuple[int, datetime]]):
+        """Replace the index with the given (order_id, created_at) pairs"""
+        self._buckets.clear()
+        self._size = 0
+        for order_id, created_at in sorted(orders, key=lambda entry: (entry[1], entry[0])):
+            bucket = self._buckets.get(created_at.date())
+            if bucket is None:
+                bucket = self._buckets[created_at.date()] = _DayBucket()
+            bucket.times.append(created_at)
+            bucket.ids.append(order_id)
+            self._size += 1
+        self._days = sorted(self._buckets)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def range(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        newest_first: bool = False,
+    ) -> Iterator[int]:
+        """Order ids created in [start, end), oldest first unless `newest_first`"""
+        days = self._days
+        first = bisect_left(days, start.date()) if start is not None else 0
+        last = bisect_right(days, end.date()) if end is not None else len(days)
+        selected = days[first:last]
+        if newest_first:
+            selected.reverse()
+
+        for day in selected:
+            bucket = self._buckets[day]
+            times = bucket.times
+            low = bisect_left(times, start) if start is not None and day == start.date() else 0
+            high = bisect_left(times, end) if end is not None and day == end.date() else len(times)
+            if newest_first:
+                for position in range(high - 1, low - 1, -1):
+                    yield bucket.ids[position]
+            else:
+                for position in range(low, high):
+                    yield bucket.ids[position]
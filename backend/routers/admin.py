@@ -0,0 +1,95 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from datetime import date, datetime, time
+from typing import List, Optional, Union
+from schemas.analytics import SalesSummary, ProductSales, CategorySales, DailySales
+from schemas.order import OrderResponse
+from services.analytics_service import AnalyticsService
+from services.recommendation_service import RecommendationService
+from services.order_service import OrderService, ORDER_STATUS_TRANSITIONS
+from services.export_service import ExportService
+from services.order_pipeline import order_queue
+from services.job_queue import QueueFullError
+from routers.auth import require_admin
+
+router = APIRouter(prefix="/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/analytics/summary", response_model=SalesSummary)
+async def get_sales_summary():
+    """Get total revenue, units and order counts by status (admin only)"""
+    return AnalyticsService.get_summary()
+
+
+@router.get("/analytics/products", response_model=List[ProductSales])
+async def get_product_sales(
+    limit: int = Query(10, ge=1, le=100, description="Number of products to return")
+):
+    """Get top-selling products by revenue (admin only)"""
+    return AnalyticsService.get_product_sales(limit=limit)
+
+
+@router.get("/analytics/categories", response_model=List[CategorySales])
+async def get_category_sales():
+    """Get revenue and units by category (admin only)"""
+    return AnalyticsService.get_category_sales()
+
+
+@router.get("/analytics/daily", response_model=List[DailySales])
+async def get_daily_sales(
+    days: int = Query(30, ge=1, le=366, description="Number of most recent days to return")
+):
+    """Get revenue, units and order count per day (admin only)"""
+    return AnalyticsService.get_daily_sales(days=days)
+
+
+@router.post("/analytics/rebuild", response_model=SalesSummary)
+async def rebuild_analytics():
+    """Recompute all sales aggregates from the order history (admin only)"""
+    AnalyticsService.rebuild()
+    return AnalyticsService.get_summary()
+
+
+@router.post("/recommendations/rebuild")
+async def rebuild_recommendations():
+    """Schedule a full rebuild of the co-occurrence matrix (admin only)"""
+    try:
+        order_queue.submit("rebuild_recommendations", RecommendationService.rebuild)
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    return {"message": "Recommendation rebuild scheduled"}
+
+
+@router.get("/orders", response_model=List[OrderResponse])
+async def get_all_orders(
+    skip: int = Query(0, ge=0, description="Number of items to skip"),
+    limit: int = Query(100, ge=1, le=100, description="Number of items to return")
+):
+    """Get all orders, newest first (admin only)"""
+    return OrderService.get_all_orders(skip=skip, limit=limit)
+
+
+@router.get("/orders/export")
+async def export_orders(
+    start: Optional[Union[datetime, date]] = Query(None, description="Include orders created at or after this date/time (UTC if no offset)"),
+    end: Optional[Union[datetime, date]] = Query(None, description="Include orders created before this date/time"),
+    status: Optional[str] = Query(None, description="Only orders with this status"),
+    fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="ndjson or csv")
+):
+    """Stream orders in a date range as NDJSON or CSV (admin only)"""
+    if status is not None and status not in ORDER_STATUS_TRANSITIONS:
+        raise HTTPException(status_code=400, detail=f"Unknown order status: {status}")
+    
+    # A bare date means midnight at the start of that day
+    if start is not None and not isinstance(start, datetime):
+        start = datetime.combine(start, time.min)
+    if end is not None and not isinstance(end, datetime):
+        end = datetime.combine(end, time.min)
+    
+    media_type = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    filename = f"orders.{'csv' if fmt == 'csv' else 'ndjson'}"
+    return StreamingResponse(
+        ExportService.export_orders(start=start, end=end, status=status, fmt=fmt),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,95 @@
+import ipaddress
+from typing import Optional
+from fastapi import HTTPException, Request, Response, status
+from fastapi.responses import JSONResponse
+from config import settings
+from services.admission_service import (
+    OverloadedError, RateLimitedError, concurrency_limiter, rate_limiter
+)
+from routers.auth import verify_request_token
+
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+_trusted_proxies = [ipaddress.ip_network(proxy, strict=False) for proxy in settings.trusted_proxies]
+
+
+def _is_trusted_proxy(host: str) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return any(address in network for network in _trusted_proxies)
+
+
+def client_key(request: Request) -> str:
+    """Rate limit key: the authenticated user, else the client address"""
+    authorization = request.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() == "bearer" and token:
+        token_data = verify_request_token(request, token)
+        if token_data is not None:
+            return f"user:{token_data.user_id}"
+    address = request.client.host if request.client else "unknown"
+    # nginx overwrites X-Real-IP with the real client address. From anyone
+    # else the header is ignored: a direct client could send a new value on
+    # every request and get a fresh bucket each time.
+    if _is_trusted_proxy(address):
+        address = request.headers.get("x-real-ip") or address
+    return f"ip:{address}"
+
+
+def _check_rate(request: Request, budget: str):
+    try:
+        rate_limiter.check(client_key(request), budget)
+    except RateLimitedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+
+async def admit_request(request: Request):
+    """Apply the caller's read or write budget and hold a concurrency slot for the request"""
+    if not settings.admission_enabled:
+        yield
+        return
+    _check_rate(request, "read" if request.method in READ_METHODS else "write")
+    try:
+        await concurrency_limiter.acquire()
+    except OverloadedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    try:
+        yield
+    finally:
+        concurrency_limiter.release()
+
+
+def admit_checkout(request: Request):
+    """Apply the caller's checkout budget, on top of the write budget"""
+    if settings.admission_enabled:
+        _check_rate(request, "checkout")
+
+
+def admit_cache_hit(request: Request) -> Optional[Response]:
+    """Apply the read budget to a response served from the catalog cache.
+
+    Cache hits are answered before routing and skip `admit_request`; they
+    still spend the caller's read budget but take no concurrency slot, as
+    they never wait on anything.
+    """
+    if not settings.admission_enabled:
+        return None
+    try:
+        rate_limiter.check(client_key(request), "read")
+    except RateLimitedError as e:
+        return JSONResponse(
+            {"detail": str(e)},
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    return None
@@ -1,15 +1,28 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from schemas.user import UserCreate, UserLogin, UserResponse, Token
+from typing import Optional
+from schemas.user import UserCreate, UserLogin, UserResponse, Token, TokenData
 from services.auth_service import AuthService
+from config import settings
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+def verify_request_token(request: Request, token: str) -> Optional[TokenData]:
+    """Verify a bearer token once per request, sharing the result with admission control"""
+    cached = getattr(request.state, "verified_token", None)
+    if cached is not None and cached[0] == token:
+        return cached[1]
+    token_data = AuthService.verify_token(token)
+    request.state.verified_token = (token, token_data)
+    return token_data
+
+
+def get_current_user(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
     """Get current authenticated user"""
-    token_data = AuthService.verify_token(credentials.credentials)
+    token_data = verify_request_token(request, credentials.credentials)
     if token_data is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -33,6 +46,28 @@ def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(securit
     return user_dict
 
 
+def is_admin(user: dict) -> bool:
+    """Whether a user is listed as an administrator"""
+    return user["id"] in settings.admin_user_ids
+
+
+def require_admin(current_user: dict = Depends(get_current_user)) -> dict:
+    """Get current user, rejecting anyone who is not an administrator"""
+    if not is_admin(current_user):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return current_user
+
+
+def get_optional_user(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+) -> Optional[dict]:
+    """Get current user if a token was sent, None for anonymous requests"""
+    if credentials is None:
+        return None
+    return get_current_user(request, credentials)
+
+
 @router.post("/register", response_model=Token)
 async def register(user: UserCreate):
     """Register a new user"""
@@ -0,0 +1,66 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from typing import Optional
+from schemas.bootstrap import BootstrapResponse
+from services.cart_service import CartService
+from services.product_service import ProductService
+from routers.auth import get_optional_user
+
+router = APIRouter(prefix="/bootstrap", tags=["bootstrap"])
+
+BOOTSTRAP_FIELDS = ("categories", "featured", "cart", "user")
+
+
+def _categories(user: Optional[dict]):
+    return ProductService.get_categories()
+
+
+def _featured(user: Optional[dict]):
+    return ProductService.get_featured_products()
+
+
+def _cart(user: Optional[dict]):
+    return CartService.get_cart_summary(user["id"]) if user else None
+
+
+def _user(user: Optional[dict]):
+    return user
+
+
+_RESOLVERS = {
+    "categories": _categories,
+    "featured": _featured,
+    "cart": _cart,
+    "user": _user,
+}
+
+
+@router.get("/", response_model=BootstrapResponse, response_model_exclude_unset=True)
+async def get_bootstrap(
+    fields: Optional[str] = Query(
+        None, description="Comma-separated subset of: categories, featured, cart, user"
+    ),
+    current_user: Optional[dict] = Depends(get_optional_user),
+):
+    """Everything the home page needs in one request.
+
+    The token is verified once for the whole request; `cart` and `user` are
+    null for anonymous callers.
+    """
+    if fields:
+        selected = list(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+        unknown = [f for f in selected if f not in _RESOLVERS]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(BOOTSTRAP_FIELDS)}",
+            )
+    else:
+        selected = list(BOOTSTRAP_FIELDS)
+
+    # Read the version before resolving so a concurrent write can only make
+    # the response newer than advertised, never older
+    result = {"catalog_version": ProductService.get_catalog_version()}
+    # The resolvers only read in-memory state, so they run inline
+    for name in selected:
+        result[name] = _RESOLVERS[name](current_user)
+    return result
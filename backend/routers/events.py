@@ -0,0 +1,122 @@
+import json
+from fastapi import APIRouter, HTTPException, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from fastapi.security import HTTPAuthorizationCredentials
+from typing import List, Optional
+from config import settings
+from database import in_memory_storage
+from services.event_hub import Event, HubFullError, TooManySubscriptionsError
+from services.event_service import EventService, event_hub, product_topic, user_orders_topic
+from routers.auth import get_current_user, optional_security
+from routers.admission import client_key
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+def get_stream_user(
+    request: Request,
+    access_token: Optional[str] = Query(None, description="Bearer token, for clients like EventSource that can't set headers"),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security),
+) -> Optional[dict]:
+    """Get current user from the Authorization header or `access_token`, None if neither is sent"""
+    if credentials is None and access_token:
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=access_token)
+    if credentials is None:
+        return None
+    return get_current_user(request, credentials)
+
+
+def _frame(event: Event) -> str:
+    return f"id: {event.id}\nevent: {event.type}\ndata: {event.data}\n\n"
+
+
+def _parse_ids(value: Optional[str]) -> List[int]:
+    if not value:
+        return []
+    try:
+        ids = list(dict.fromkeys(int(part) for part in value.split(",") if part.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="products must be a comma-separated list of ids")
+    if len(ids) > settings.events_max_products:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.events_max_products} products per subscription",
+        )
+    return ids
+
+
+@router.get("/")
+async def stream_events(
+    request: Request,
+    products: Optional[str] = Query(None, description="Comma-separated product ids to watch for stock and price changes"),
+    orders: bool = Query(False, description="Watch status changes of your orders"),
+    current_user: Optional[dict] = Depends(get_stream_user),
+):
+    """Server-sent event stream of live stock, price and order status updates.
+
+    Events: `product` (stock/price of a watched product, sent once on
+    connect and on every change), `order_status` (a status transition of one
+    of your orders) and `overflow` (the client fell too far behind and should
+    reconnect and refetch).
+    """
+    product_ids = _parse_ids(products)
+    if orders and current_user is None:
+        raise HTTPException(
+            status_code=401,
+            detail="Authentication required to watch orders",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    topics = [product_topic(product_id) for product_id in product_ids]
+    if orders:
+        topics.append(user_orders_topic(current_user["id"]))
+    if not topics:
+        raise HTTPException(status_code=400, detail="Nothing to watch: pass products and/or orders=true")
+
+    # Streams are exempt from admission control, so cap them per client here
+    client = f"user:{current_user['id']}" if current_user else client_key(request)
+    try:
+        subscription = event_hub.subscribe(topics, client=client)
+    except TooManySubscriptionsError as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": "5"})
+    except HubFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+
+    # Current state, read after subscribing so no change can fall in between
+    catalog = in_memory_storage["products"].current()
+    initial = [
+        EventService.product_state(catalog.get(product_id))
+        for product_id in product_ids
+        if product_id in catalog
+    ]
+
+    async def stream():
+        try:
+            yield f"retry: {settings.events_heartbeat_seconds * 1000}\n\n"
+            for state in initial:
+                yield f"event: product\ndata: {json.dumps(state, default=str)}\n\n"
+            while True:
+                events = await subscription.get(
+                    timeout=settings.events_heartbeat_seconds,
+                    coalesce=settings.events_coalesce_ms / 1000,
+                )
+                if events:
+                    yield "".join(_frame(event) for event in events)
+                if subscription.closed:
+                    if subscription.overflowed:
+                        yield "event: overflow\ndata: {}\n\n"
+                    break
+                if not events:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keep-alive\n\n"
+        finally:
+            event_hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Also covers streams that end before the generator ever starts
+        background=BackgroundTask(event_hub.unsubscribe, subscription),
+    )
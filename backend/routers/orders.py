@@ -2,12 +2,18 @@ from fastapi import APIRouter, HTTPException, Depends, Query
 from typing import List
 from schemas.order import OrderCreate, OrderResponse, OrderListResponse
 from services.order_service import OrderService
-from routers.auth import get_current_user
+from services.job_queue import QueueFullError
+from routers.auth import get_current_user, is_admin
+from routers.admission import admit_checkout
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
+# Status changes a customer may make to their own order; the rest are made by
+# the order pipeline or an administrator
+CUSTOMER_STATUS_CHANGES = {"cancelled"}
 
-@router.post("/", response_model=OrderResponse)
+
+@router.post("/", response_model=OrderResponse, dependencies=[Depends(admit_checkout)])
 async def create_order(
     order: OrderCreate,
     current_user: dict = Depends(get_current_user)
@@ -17,6 +23,8 @@ async def create_order(
     try:
         new_order = OrderService.create_order(user_id, order)
         return new_order
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -58,16 +66,21 @@ async def update_order_status(
     status: str,
     current_user: dict = Depends(get_current_user)
 ):
-    """Update order status (admin only)"""
+    """Update order status; customers may only cancel their own orders"""
     user_id = current_user["id"]
     order = OrderService.get_order_by_id(order_id)
     
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
     
-    # Check if order belongs to current user (for now, allow users to update their own orders)
-    if order["user_id"] != user_id:
-        raise HTTPException(status_code=403, detail="Access denied")
+    if not is_admin(current_user):
+        if order["user_id"] != user_id:
+            raise HTTPException(status_code=403, detail="Access denied")
+        if status not in CUSTOMER_STATUS_CHANGES:
+            raise HTTPException(status_code=403, detail=f"Customers cannot set order status to {status}")
     
-    updated_order = OrderService.update_order_status(order_id, status)
+    try:
+        updated_order = OrderService.update_order_status(order_id, status)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return {"message": "Order status updated successfully", "order": updated_order}
\ No newline at end of file
@@ -1,24 +1,74 @@
-from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi import APIRouter, HTTPException, Query, Depends, Request, Response
 from typing import List, Optional
-from schemas.product import ProductResponse, ProductCreate, ProductUpdate, ProductListResponse
+from schemas.product import ProductResponse, ProductCreate, ProductUpdate, ProductListResponse, ProductSuggestion
 from services.product_service import ProductService
+from services.recommendation_service import RecommendationService
+from services.suggest_service import SuggestService
+from config import settings
+from middleware.response_cache import mark_cacheable
 
 router = APIRouter(prefix="/products", tags=["products"])
 
 
-@router.get("/", response_model=List[ProductResponse])
+def catalog_etag(request: Request, response: Response):
+    """Tag catalog reads with the catalog version and answer revalidations with 304"""
+    version = ProductService.get_catalog_version()
+    etag = f'W/"catalog-{version}"'
+    if request.headers.get("if-none-match") == etag:
+        raise HTTPException(
+            status_code=304,
+            headers={"ETag": etag, "X-Catalog-Version": str(version)}
+        )
+    response.headers["ETag"] = etag
+    response.headers["X-Catalog-Version"] = str(version)
+
+
+def catalog_cacheable(response: Response):
+    """Let the shared response cache serve this response until the catalog changes"""
+    mark_cacheable(response)
+
+
+def set_catalog_version(response: Response):
+    """Report the catalog version produced by a write"""
+    response.headers["X-Catalog-Version"] = str(ProductService.get_catalog_version())
+
+
+@router.get("/", response_model=List[ProductResponse], dependencies=[Depends(catalog_etag)])
 async def get_products(
+    response: Response,
     category: Optional[str] = Query(None, description="Filter by category"),
     search: Optional[str] = Query(None, description="Search in name and description"),
+    fuzzy: bool = Query(False, description="Tolerate typos, transliterations and synonyms in search"),
     skip: int = Query(0, ge=0, description="Number of items to skip"),
     limit: int = Query(100, ge=1, le=100, description="Number of items to return")
 ):
     """Get products with optional filtering and pagination"""
-    products = ProductService.get_products(category=category, search=search, skip=skip, limit=limit)
+    # Searches stay uncached so every query still counts towards suggestions
+    if search is None:
+        mark_cacheable(response)
+    products = ProductService.get_products(
+        category=category, search=search, skip=skip, limit=limit, fuzzy=fuzzy
+    )
     return products
 
 
-@router.get("/{product_id}", response_model=ProductResponse)
+@router.get("/suggest", response_model=List[ProductSuggestion])
+async def suggest_products(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=100, description="Prefix typed so far"),
+    limit: int = Query(8, ge=1, le=10, description="Number of suggestions to return")
+):
+    """Get typeahead suggestions for product names, categories and popular searches"""
+    # Popular searches change without a catalog write, so no catalog ETag or
+    # shared cache here; clients and CDNs hold suggestions for a short max-age
+    response.headers["Cache-Control"] = (
+        f"public, max-age={settings.suggest_cache_max_age}, "
+        f"stale-while-revalidate={settings.suggest_cache_max_age * 2}"
+    )
+    return SuggestService.suggest(q, limit=limit)
+
+
+@router.get("/{product_id}", response_model=ProductResponse, dependencies=[Depends(catalog_etag), Depends(catalog_cacheable)])
 async def get_product(product_id: int):
     """Get product by ID"""
     product = ProductService.get_product_by_id(product_id)
@@ -27,7 +77,18 @@ async def get_product(product_id: int):
     return product
 
 
-@router.get("/categories/list", response_model=List[str])
+@router.get("/{product_id}/related", response_model=List[ProductResponse])
+async def get_related_products(
+    product_id: int,
+    limit: int = Query(4, ge=1, le=12, description="Number of related products to return")
+):
+    """Get products frequently bought together with this product"""
+    if not ProductService.get_product_by_id(product_id):
+        raise HTTPException(status_code=404, detail="Product not found")
+    return RecommendationService.get_related_products(product_id, limit=limit)
+
+
+@router.get("/categories/list", response_model=List[str], dependencies=[Depends(catalog_etag), Depends(catalog_cacheable)])
 async def get_categories():
     """Get all product categories"""
     categories = ProductService.get_categories()
@@ -35,28 +96,31 @@ async def get_categories():
 
 
 @router.post("/", response_model=ProductResponse)
-async def create_product(product: ProductCreate):
+async def create_product(product: ProductCreate, response: Response):
     """Create a new product (admin only)"""
     try:
         new_product = ProductService.create_product(product)
+        set_catalog_version(response)
         return new_product
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.put("/{product_id}", response_model=ProductResponse)
-async def update_product(product_id: int, product: ProductUpdate):
+async def update_product(product_id: int, product: ProductUpdate, response: Response):
     """Update a product (admin only)"""
     updated_product = ProductService.update_product(product_id, product)
     if not updated_product:
         raise HTTPException(status_code=404, detail="Product not found")
+    set_catalog_version(response)
     return updated_product
 
 
 @router.delete("/{product_id}")
-async def delete_product(product_id: int):
+async def delete_product(product_id: int, response: Response):
     """Delete a product (admin only)"""
     success = ProductService.delete_product(product_id)
     if not success:
         raise HTTPException(status_code=404, detail="Product not found")
+    set_catalog_version(response)
     return {"message": "Product deleted successfully"}
\ No newline at end of file
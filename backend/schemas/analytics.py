@@ -0,0 +1,28 @@
+from pydantic import BaseModel
+from typing import Dict
+
+
+class SalesSummary(BaseModel):
+    total_revenue: float
+    total_units: int
+    total_orders: int
+    orders_by_status: Dict[str, int]
+
+
+class ProductSales(BaseModel):
+    product_id: int
+    revenue: float
+    units: int
+
+
+class CategorySales(BaseModel):
+    category: str
+    revenue: float
+    units: int
+
+
+class DailySales(BaseModel):
+    day: str
+    revenue: float
+    units: int
+    orders: int
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from schemas.cart import CartSummary
+from schemas.product import ProductResponse
+from schemas.user import UserResponse
+
+
+class BootstrapResponse(BaseModel):
+    catalog_version: int
+    categories: Optional[List[str]] = None
+    featured: Optional[List[ProductResponse]] = None
+    cart: Optional[CartSummary] = None
+    user: Optional[UserResponse] = None
@@ -22,4 +22,8 @@ class CartItemResponse(CartItemBase):
 class CartResponse(BaseModel):
     items: List[CartItemResponse]
     total_items: int
-    total_amount: float
\ No newline at end of file
+    total_amount: float
+
+class CartSummary(BaseModel):
+    total_items: int
+    total_amount: float
@@ -39,6 +39,12 @@ class ProductResponse(ProductBase):
         from_attributes = True
 
 
+class ProductSuggestion(BaseModel):
+    text: str
+    type: str
+    product_id: Optional[int] = None
+
+
 class ProductListResponse(BaseModel):
     products: list[ProductResponse]
     total: int
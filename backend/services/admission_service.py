@@ -0,0 +1,181 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, Tuple
+from config import settings
+
+
+class RateLimitedError(Exception):
+    """Raised when a client has used up its request budget"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Rate limit exceeded, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class OverloadedError(Exception):
+    """Raised when a request is shed because the server is overloaded"""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Server is overloaded, please retry shortly")
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """Refills at `rate` tokens per second up to `capacity`"""
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def take(self) -> float:
+        """Take a token; return 0 on success or the seconds until one is available"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+
+class RateLimiter:
+    """Token buckets per (client, budget), keeping only the most recently seen clients"""
+
+    def __init__(self, budgets: Dict[str, Tuple[float, int]], max_clients: int = 100000):
+        self.budgets = budgets
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[Tuple[str, str], TokenBucket]" = OrderedDict()
+        self.limited: Dict[str, int] = {budget: 0 for budget in budgets}
+
+    def check(self, client: str, budget: str):
+        """Spend one request from the client's budget or raise RateLimitedError"""
+        key = (client, budget)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            rate, burst = self.budgets[budget]
+            bucket = self._buckets[key] = TokenBucket(rate, burst)
+            # An evicted client just starts again with a full bucket
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        wait = bucket.take()
+        if wait:
+            self.limited[budget] += 1
+            raise RateLimitedError(max(1, math.ceil(wait)))
+
+    def get_stats(self) -> dict:
+        return {"buckets": len(self._buckets), "limited": dict(self.limited)}
+
+
+class ConcurrencyLimiter:
+    """Caps in-flight requests and sheds load when the wait queue stops draining.
+
+    Requests beyond `limit` wait in FIFO order. Queueing delay is measured for
+    every admitted request; if even the shortest delay seen over an
+    `interval` exceeds `target` (the queue never emptied, CoDel-style), the
+    limiter switches to shedding and rejects requests that would have to wait,
+    until delays fall back under the target. `clock` is injectable for tests.
+    """
+
+    def __init__(
+        self,
+        limit: int,
+        target: float,
+        interval: float,
+        max_queue: int,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.limit = limit
+        self.target = target
+        self.interval = interval
+        self.max_queue = max_queue
+        self.clock = clock
+        self.active = 0
+        self.shedding = False
+        self.admitted = 0
+        self.shed = 0
+        self.queue_delay = 0.0  # smoothed seconds spent waiting for a slot
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._window_start = clock()
+        self._window_min = math.inf
+
+    def retry_after(self) -> int:
+        """Seconds a shed client should wait, from the measured queueing delay"""
+        backlog = 1 + len(self._waiters) / self.limit
+        return max(1, math.ceil(max(self.queue_delay, self.target) * backlog))
+
+    async def acquire(self):
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            self._observe(0.0)
+            return
+        if self.shedding or len(self._waiters) >= self.max_queue:
+            self.shed += 1
+            raise OverloadedError(self.retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        start = self.clock()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over just as we were cancelled
+                self.release()
+            else:
+                self._waiters.remove(waiter)
+            raise
+        self._observe(self.clock() - start)
+
+    def release(self):
+        # Hand the slot straight to the next waiter so nobody can jump the queue
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def _observe(self, delay: float):
+        self.admitted += 1
+        self.queue_delay += (delay - self.queue_delay) * 0.1
+        self._window_min = min(self._window_min, delay)
+        now = self.clock()
+        if now - self._window_start >= self.interval:
+            self.shedding = self._window_min > self.target
+            self._window_start = now
+            self._window_min = math.inf
+
+    def get_stats(self) -> dict:
+        return {
+            "active": self.active,
+            "limit": self.limit,
+            "queued": len(self._waiters),
+            "queue_delay_ms": round(self.queue_delay * 1000, 3),
+            "shedding": self.shedding,
+            "admitted": self.admitted,
+            "shed": self.shed,
+        }
+
+
+rate_limiter = RateLimiter(
+    {
+        "read": (settings.rate_limit_read_per_second, settings.rate_limit_read_burst),
+        "write": (settings.rate_limit_write_per_second, settings.rate_limit_write_burst),
+        "checkout": (settings.rate_limit_checkout_per_second, settings.rate_limit_checkout_burst),
+    },
+    max_clients=settings.rate_limit_max_clients,
+)
+
+concurrency_limiter = ConcurrencyLimiter(
+    limit=settings.max_concurrent_requests,
+    target=settings.admission_queue_target_ms / 1000,
+    interval=settings.admission_queue_interval_ms / 1000,
+    max_queue=settings.admission_max_queue,
+)
@@ -0,0 +1,177 @@
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Dict, List
+from database import in_memory_storage
+
+
+def _empty_aggregates() -> dict:
+    return {
+        "revenue_by_product": defaultdict(float),
+        "units_by_product": defaultdict(int),
+        "revenue_by_category": defaultdict(float),
+        "units_by_category": defaultdict(int),
+        "revenue_by_day": defaultdict(float),
+        "units_by_day": defaultdict(int),
+        "orders_by_day": defaultdict(int),
+        "orders_by_status": Counter(),
+        "total_revenue": 0.0,
+        "total_units": 0,
+        "total_orders": 0,
+    }
+
+
+# Materialized sales aggregates, kept current by OrderService on every order
+# creation and status change. Cancelled orders don't count towards revenue.
+_aggregates = _empty_aggregates()
+
+
+def _order_day(order: dict) -> str:
+    created_at = order["created_at"]
+    if isinstance(created_at, datetime):
+        return created_at.date().isoformat()
+    return created_at[:10]
+
+
+class AnalyticsService:
+    @staticmethod
+    def _apply_sales(order: dict, sign: int):
+        """Add (sign=1) or remove (sign=-1) an order's lines from the revenue aggregates"""
+        day = _order_day(order)
+        units_total = 0
+        for item in order["items"]:
+            revenue = sign * item["quantity"] * item.get("unit_price", 0.0)
+            units = sign * item["quantity"]
+            category = item.get("category", "Uncategorized")
+            _aggregates["revenue_by_product"][item["product_id"]] += revenue
+            _aggregates["units_by_product"][item["product_id"]] += units
+            _aggregates["revenue_by_category"][category] += revenue
+            _aggregates["units_by_category"][category] += units
+            _aggregates["revenue_by_day"][day] += revenue
+            _aggregates["units_by_day"][day] += units
+            units_total += units
+
+        _aggregates["orders_by_day"][day] += sign
+        _aggregates["total_revenue"] += sign * order["total_amount"]
+        _aggregates["total_units"] += units_total
+        _aggregates["total_orders"] += sign
+
+        if sign < 0:
+            # Forget keys left without sales, as a rebuild would never create them
+            for item in order["items"]:
+                AnalyticsService._drop_if_empty("product", item["product_id"])
+                AnalyticsService._drop_if_empty("category", item.get("category", "Uncategorized"))
+            if _aggregates["orders_by_day"][day] <= 0:
+                for name in ("revenue_by_day", "units_by_day", "orders_by_day"):
+                    _aggregates[name].pop(day, None)
+
+    @staticmethod
+    def _drop_if_empty(dimension: str, key):
+        if _aggregates[f"units_by_{dimension}"].get(key, 0) <= 0:
+            _aggregates[f"units_by_{dimension}"].pop(key, None)
+            _aggregates[f"revenue_by_{dimension}"].pop(key, None)
+
+    @staticmethod
+    def record_order(order: dict):
+        """Account for a newly created order"""
+        _aggregates["orders_by_status"][order["status"]] += 1
+        if order["status"] != "cancelled":
+            AnalyticsService._apply_sales(order, 1)
+
+    @staticmethod
+    def record_status_change(order: dict, old_status: str, new_status: str):
+        """Move an order between status buckets, reversing its sales on cancellation"""
+        _aggregates["orders_by_status"][old_status] -= 1
+        _aggregates["orders_by_status"][new_status] += 1
+        if new_status == "cancelled" and old_status != "cancelled":
+            AnalyticsService._apply_sales(order, -1)
+
+    @staticmethod
+    def rebuild():
+        """Recompute every aggregate from scratch in a single columnar pass"""
+        orders = list(in_memory_storage["orders"].values())
+        fresh = _empty_aggregates()
+        fresh["orders_by_status"] = Counter(o["status"] for o in orders)
+
+        live = [o for o in orders if o["status"] != "cancelled"]
+        days = [_order_day(o) for o in live]
+        fresh["orders_by_day"].update(Counter(days))
+        fresh["total_orders"] = len(live)
+        fresh["total_revenue"] = sum(o["total_amount"] for o in live)
+
+        # Flatten order lines into parallel columns, then reduce each column once
+        product_ids, categories, line_days, quantities, revenues = [], [], [], [], []
+        for order, day in zip(live, days):
+            for item in order["items"]:
+                product_ids.append(item["product_id"])
+                categories.append(item.get("category", "Uncategorized"))
+                line_days.append(day)
+                quantities.append(item["quantity"])
+                revenues.append(item["quantity"] * item.get("unit_price", 0.0))
+
+        for keys, revenue_name, units_name in (
+            (product_ids, "revenue_by_product", "units_by_product"),
+            (categories, "revenue_by_category", "units_by_category"),
+            (line_days, "revenue_by_day", "units_by_day"),
+        ):
+            revenue_agg, units_agg = fresh[revenue_name], fresh[units_name]
+            for key, quantity, revenue in zip(keys, quantities, revenues):
+                revenue_agg[key] += revenue
+                units_agg[key] += quantity
+        fresh["total_units"] = sum(quantities)
+
+        _aggregates.clear()
+        _aggregates.update(fresh)
+
+    @staticmethod
+    def get_summary() -> dict:
+        """Overall revenue, units and order counts by status"""
+        return {
+            "total_revenue": round(_aggregates["total_revenue"], 2),
+            "total_units": _aggregates["total_units"],
+            "total_orders": _aggregates["total_orders"],
+            "orders_by_status": {
+                status: count for status, count in _aggregates["orders_by_status"].items() if count
+            },
+        }
+
+    @staticmethod
+    def get_product_sales(limit: int = 10) -> List[dict]:
+        """Top products by revenue"""
+        revenue = _aggregates["revenue_by_product"]
+        top = sorted(revenue, key=revenue.get, reverse=True)[:limit]
+        return [
+            {
+                "product_id": product_id,
+                "revenue": round(revenue[product_id], 2),
+                "units": _aggregates["units_by_product"][product_id],
+            }
+            for product_id in top
+        ]
+
+    @staticmethod
+    def get_category_sales() -> List[dict]:
+        """Revenue and units per category, highest revenue first"""
+        revenue = _aggregates["revenue_by_category"]
+        return [
+            {
+                "category": category,
+                "revenue": round(revenue[category], 2),
+                "units": _aggregates["units_by_category"][category],
+            }
+            for category in sorted(revenue, key=revenue.get, reverse=True)
+        ]
+
+    @staticmethod
+    def get_daily_sales(days: int = 30) -> List[dict]:
+        """Revenue, units and order count per day, most recent first"""
+        revenue: Dict[str, float] = _aggregates["revenue_by_day"]
+        recent = sorted(revenue, reverse=True)[:days]
+        return [
+            {
+                "day": day,
+                "revenue": round(revenue[day], 2),
+                "units": _aggregates["units_by_day"][day],
+                "orders": _aggregates["orders_by_day"][day],
+            }
+            for day in recent
+        ]
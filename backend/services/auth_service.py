@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 from typing import Optional
 from config import settings
 from database import in_memory_storage
+from services.persistence_service import PersistenceService
 from schemas.user import UserCreate, UserLogin, TokenData
 
 
@@ -61,6 +62,7 @@ class AuthService:
         user_dict["created_at"] = datetime.utcnow().isoformat()
         
         in_memory_storage["users"][user_id] = user_dict
+        PersistenceService.record_put("users", user_id, user_dict)
         
         # Remove password from response
         user_dict.pop("password", None)
@@ -1,18 +1,32 @@
+import asyncio
+import logging
 from typing import List, Optional
+from config import settings
 from database import in_memory_storage
 from schemas.cart import CartItemCreate
 from services.product_service import ProductService
+from services.persistence_service import PersistenceService
+
+logger = logging.getLogger(__name__)
+
+_sweeper: Optional[asyncio.Task] = None
 
 
 class CartService:
+    @staticmethod
+    def _save(user_id: int, items: List[dict]):
+        """Write back a user's cart; an empty cart is removed rather than stored"""
+        in_memory_storage["cart"][user_id] = items
+        if items:
+            PersistenceService.record_put("cart", user_id, items)
+        else:
+            PersistenceService.record_delete("cart", user_id)
+    
     @staticmethod
     def get_cart(user_id: int) -> List[dict]:
         """Get user's cart items"""
-        if user_id not in in_memory_storage["cart"]:
-            return []
-        
         cart_items = []
-        for item in in_memory_storage["cart"][user_id]:
+        for item in in_memory_storage["cart"].get(user_id, []):
             product = ProductService.get_product_by_id(item["product_id"])
             if product:
                 cart_items.append({
@@ -30,46 +44,44 @@ class CartService:
         if not product:
             raise ValueError("Product not found")
         
-        # Initialize cart if it doesn't exist
-        if user_id not in in_memory_storage["cart"]:
-            in_memory_storage["cart"][user_id] = []
+        items = in_memory_storage["cart"].get(user_id, [])
         
         # Check if item already in cart
-        for item in in_memory_storage["cart"][user_id]:
+        for item in items:
             if item["product_id"] == cart_item.product_id:
                 item["quantity"] += cart_item.quantity
+                CartService._save(user_id, items)
                 return {"message": "Item quantity updated in cart"}
         
         # Add new item to cart
-        in_memory_storage["cart"][user_id].append(cart_item.dict())
+        items.append(cart_item.dict())
+        CartService._save(user_id, items)
         return {"message": "Item added to cart"}
     
     @staticmethod
     def remove_from_cart(user_id: int, product_id: int) -> bool:
         """Remove item from user's cart"""
-        if user_id not in in_memory_storage["cart"]:
+        cart = in_memory_storage["cart"].get(user_id)
+        if cart is None:
             return False
         
-        cart = in_memory_storage["cart"][user_id]
-        original_length = len(cart)
-        in_memory_storage["cart"][user_id] = [
-            item for item in cart if item["product_id"] != product_id
-        ]
-        
-        return len(in_memory_storage["cart"][user_id]) < original_length
+        remaining = [item for item in cart if item["product_id"] != product_id]
+        if len(remaining) == len(cart):
+            return False
+        CartService._save(user_id, remaining)
+        return True
     
     @staticmethod
     def update_cart_item_quantity(user_id: int, product_id: int, quantity: int) -> bool:
         """Update quantity of item in cart"""
-        if user_id not in in_memory_storage["cart"]:
-            return False
-        
-        for item in in_memory_storage["cart"][user_id]:
+        items = in_memory_storage["cart"].get(user_id, [])
+        for item in items:
             if item["product_id"] == product_id:
                 if quantity <= 0:
                     return CartService.remove_from_cart(user_id, product_id)
                 else:
                     item["quantity"] = quantity
+                    CartService._save(user_id, items)
                     return True
         
         return False
@@ -78,7 +90,7 @@ class CartService:
     def clear_cart(user_id: int) -> bool:
         """Clear user's cart"""
         if user_id in in_memory_storage["cart"]:
-            in_memory_storage["cart"][user_id] = []
+            CartService._save(user_id, [])
             return True
         return False
     
@@ -97,4 +109,52 @@ class CartService:
     def get_cart_items_count(user_id: int) -> int:
         """Get total number of items in cart"""
         cart_items = CartService.get_cart(user_id)
-        return sum(item["quantity"] for item in cart_items)
\ No newline at end of file
+        return sum(item["quantity"] for item in cart_items)
+    
+    @staticmethod
+    def get_cart_summary(user_id: int) -> dict:
+        """Get item count and total amount of the cart in one pass"""
+        total_items = 0
+        total_amount = 0.0
+        for item in CartService.get_cart(user_id):
+            total_items += item["quantity"]
+            total_amount += item["product"]["price"] * item["quantity"]
+        return {"total_items": total_items, "total_amount": total_amount}
+    
+    @staticmethod
+    def sweep_idle_carts() -> int:
+        """Spill idle carts to disk and drop expired ones; returns carts handled"""
+        handled, expired = in_memory_storage["cart"].sweep(
+            settings.cart_spill_after_seconds,
+            settings.cart_ttl_seconds,
+            limit=settings.cart_sweep_batch,
+        )
+        for user_id in expired:
+            PersistenceService.record_delete("cart", user_id)
+        return handled
+    
+    @staticmethod
+    async def _sweep_forever():
+        while True:
+            await asyncio.sleep(settings.cart_sweep_interval_seconds)
+            try:
+                # Work in batches so a large sweep doesn't stall the event loop
+                while CartService.sweep_idle_carts() >= settings.cart_sweep_batch:
+                    await asyncio.sleep(0)
+            except Exception:
+                logger.exception("Cart sweep failed")
+    
+    @staticmethod
+    async def start_sweeper():
+        """Start the periodic idle cart sweep"""
+        global _sweeper
+        if _sweeper is None:
+            _sweeper = asyncio.create_task(CartService._sweep_forever(), name="cart-sweeper")
+    
+    @staticmethod
+    async def stop_sweeper():
+        global _sweeper
+        if _sweeper is not None:
+            _sweeper.cancel()
+            await asyncio.gather(_sweeper, return_exceptions=True)
+            _sweeper = None
@@ -0,0 +1,207 @@
+import asyncio
+import itertools
+import json
+import logging
+import time
+from datetime import date
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+def _encode(value: Any) -> str:
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)
+
+
+class HubFullError(Exception):
+    """Raised when the hub already has its maximum number of subscribers"""
+
+
+class TooManySubscriptionsError(Exception):
+    """Raised when one client already holds its maximum number of subscriptions"""
+
+
+class Event(NamedTuple):
+    id: int
+    type: str
+    data: str  # JSON, encoded once at publish and shared by every subscriber
+    published_at: float
+
+
+class Subscription:
+    """One subscriber's mailbox.
+
+    Pending events are keyed (e.g. "product:7"), so a burst of updates to the
+    same key collapses to the latest one. A subscriber that falls more than
+    `max_pending` distinct keys behind is dropped rather than buffered without
+    bound; the client is expected to reconnect and refetch.
+    """
+    __slots__ = ("topics", "client", "max_pending", "overflowed", "closed", "_pending", "_wakeup")
+
+    def __init__(self, topics: Set[str], max_pending: int, client: Optional[str] = None):
+        self.topics = topics
+        self.client = client
+        self.max_pending = max_pending
+        self.overflowed = False
+        self.closed = False
+        self._pending: Dict[str, Event] = {}
+        self._wakeup = asyncio.Event()
+
+    def _push(self, key: str, event: Event) -> Optional[bool]:
+        """Queue an event; True if it replaced a pending one, None on overflow"""
+        pending = self._pending
+        coalesced = key in pending
+        if not coalesced and len(pending) >= self.max_pending:
+            self.overflowed = True
+            self._close()
+            return None
+        pending[key] = event
+        self._wakeup.set()
+        return coalesced
+
+    def _close(self):
+        self.closed = True
+        self._wakeup.set()
+
+    async def get(self, timeout: float, coalesce: float = 0.0) -> List[Event]:
+        """Wait up to `timeout` seconds for events and return them all.
+
+        After waking, waits another `coalesce` seconds so that a burst of
+        publishes is delivered as one batch with duplicates collapsed.
+        """
+        if not self._pending and not self.closed:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+            if coalesce > 0 and not self.closed:
+                await asyncio.sleep(coalesce)
+        self._wakeup.clear()
+        events = list(self._pending.values())
+        self._pending.clear()
+        return events
+
+
+class EventHub:
+    """In-process publish/subscribe hub for pushing live updates to clients.
+
+    Publishing is synchronous and cheap when nobody listens to a topic, so
+    services can call it unconditionally. Fan-out runs on the event loop;
+    publishes from other threads are handed over with call_soon_threadsafe.
+    """
+
+    def __init__(self, max_subscribers: int = 10000, max_pending: int = 256, max_per_client: int = 5):
+        self.max_subscribers = max_subscribers
+        self.max_pending = max_pending
+        self.max_per_client = max_per_client
+        self._topics: Dict[str, Set[Subscription]] = {}
+        self._subscriptions: Set[Subscription] = set()
+        self._per_client: Dict[str, int] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ids = itertools.count(1)
+        self.published = 0
+        self.delivered = 0
+        self.coalesced = 0
+        self.dropped = 0
+
+    async def start(self):
+        """Bind the hub to the running event loop"""
+        self._loop = asyncio.get_running_loop()
+
+    async def stop(self):
+        """Close every open subscription so streams can finish"""
+        for subscription in list(self._subscriptions):
+            self.unsubscribe(subscription)
+            subscription._close()
+
+    def subscribe(self, topics: Iterable[str], client: Optional[str] = None) -> Subscription:
+        """Register a subscriber for the given topics; must run on the event loop.
+
+        `client` identifies who holds the subscription (a user or address), so
+        no single client can take up the whole hub.
+        """
+        if client is not None and self._per_client.get(client, 0) >= self.max_per_client:
+            raise TooManySubscriptionsError("Too many open live update streams")
+        if len(self._subscriptions) >= self.max_subscribers:
+            raise HubFullError("Too many live update subscribers")
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        subscription = Subscription(set(topics), self.max_pending, client)
+        self._subscriptions.add(subscription)
+        if client is not None:
+            self._per_client[client] = self._per_client.get(client, 0) + 1
+        for topic in subscription.topics:
+            self._topics.setdefault(topic, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        if subscription not in self._subscriptions:
+            return
+        self._subscriptions.discard(subscription)
+        if subscription.client is not None:
+            remaining = self._per_client[subscription.client] - 1
+            if remaining:
+                self._per_client[subscription.client] = remaining
+            else:
+                del self._per_client[subscription.client]
+        for topic in subscription.topics:
+            subscribers = self._topics.get(topic)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._topics[topic]
+
+    def publish(self, topics: Iterable[str], key: str, event_type: str, data: Dict[str, Any]):
+        """Send an event to every subscriber of any of `topics`.
+
+        Events with the same `key` still pending for a subscriber are
+        replaced, so only the latest state is delivered.
+        """
+        topics = [topic for topic in topics if topic in self._topics]
+        loop = self._loop
+        if not topics or loop is None or loop.is_closed():
+            return
+        event = Event(next(self._ids), event_type, json.dumps(data, default=_encode), time.perf_counter())
+        try:
+            on_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            self._fan_out(topics, key, event)
+        else:
+            loop.call_soon_threadsafe(self._fan_out, topics, key, event)
+
+    def _fan_out(self, topics: List[str], key: str, event: Event):
+        self.published += 1
+        if len(topics) == 1:
+            subscribers = self._topics.get(topics[0], ())
+        else:
+            subscribers = set().union(*(self._topics.get(topic, ()) for topic in topics))
+        overflowed = []
+        for subscription in subscribers:
+            result = subscription._push(key, event)
+            if result is None:
+                overflowed.append(subscription)
+            elif result:
+                self.coalesced += 1
+            else:
+                self.delivered += 1
+        for subscription in overflowed:
+            self.dropped += 1
+            self.unsubscribe(subscription)
+        if overflowed:
+            logger.warning("Dropped %d slow live update subscribers", len(overflowed))
+
+    def get_stats(self) -> dict:
+        """Subscriber count and publish/delivery counters"""
+        return {
+            "subscribers": len(self._subscriptions),
+            "clients": len(self._per_client),
+            "topics": len(self._topics),
+            "published": self.published,
+            "delivered": self.delivered,
+            "coalesced": self.coalesced,
+            "dropped": self.dropped,
+        }
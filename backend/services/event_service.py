@@ -0,0 +1,49 @@
+from config import settings
+from services.event_hub import EventHub
+
+event_hub = EventHub(
+    max_subscribers=settings.events_max_subscribers,
+    max_pending=settings.events_max_pending,
+    max_per_client=settings.events_max_per_client,
+)
+
+
+def product_topic(product_id: int) -> str:
+    return f"product:{product_id}"
+
+
+def user_orders_topic(user_id: int) -> str:
+    return f"orders:{user_id}"
+
+
+class EventService:
+    """Publishes domain changes to live update subscribers"""
+
+    @staticmethod
+    def product_state(product: dict) -> dict:
+        return {
+            "product_id": product["id"],
+            "stock": product["stock"],
+            "price": product["price"],
+            "updated_at": product.get("updated_at"),
+        }
+
+    @staticmethod
+    def publish_product_change(product: dict):
+        """Push a product's current stock and price"""
+        topic = product_topic(product["id"])
+        event_hub.publish([topic], topic, "product", EventService.product_state(product))
+
+    @staticmethod
+    def publish_order_status(order: dict):
+        """Push an order's new status to its owner"""
+        event_hub.publish(
+            [user_orders_topic(order["user_id"])],
+            f"order:{order['id']}",
+            "order_status",
+            {
+                "order_id": order["id"],
+                "status": order["status"],
+                "updated_at": order.get("updated_at"),
+            },
+        )
@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Any, Iterable, Iterator, List
+from services.order_service import OrderService
+
+# Exports are yielded in chunks of about this many characters: large enough to
+# keep per-chunk overhead low, small enough that memory stays flat
+CHUNK_SIZE = 64 * 1024
+
+ORDER_CSV_COLUMNS = [
+    "id", "user_id", "created_at", "updated_at", "status", "total_amount",
+    "items_count", "shipping_address", "invoice_number", "items",
+]
+
+
+def _encode(value: Any) -> str:
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def _chunked(lines: Iterable[str]) -> Iterator[str]:
+    buffer: List[str] = []
+    size = 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            yield "".join(buffer)
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+class ExportService:
+    @staticmethod
+    def orders_ndjson(orders: Iterable[dict]) -> Iterator[str]:
+        """Orders as newline-delimited JSON, one order per line"""
+        return _chunked(json.dumps(order, default=_encode) + "\n" for order in orders)
+
+    @staticmethod
+    def orders_csv(orders: Iterable[dict]) -> Iterator[str]:
+        """Orders as CSV, one row per order with its items as a JSON column"""
+        row = io.StringIO()
+        writer = csv.writer(row)
+
+        def lines():
+            for values in ExportService._order_rows(orders):
+                writer.writerow(values)
+                yield row.getvalue()
+                row.seek(0)
+                row.truncate()
+
+        return _chunked(lines())
+
+    @staticmethod
+    def _order_rows(orders: Iterable[dict]) -> Iterator[list]:
+        yield ORDER_CSV_COLUMNS
+        for order in orders:
+            yield [
+                order["id"],
+                order["user_id"],
+                _encode(order["created_at"]),
+                _encode(order["updated_at"]) if order.get("updated_at") else "",
+                order["status"],
+                order["total_amount"],
+                sum(item["quantity"] for item in order["items"]),
+                order["shipping_address"],
+                order.get("invoice_number", ""),
+                json.dumps(order["items"], default=_encode),
+            ]
+
+    @staticmethod
+    def export_orders(start=None, end=None, status=None, fmt: str = "ndjson") -> Iterator[str]:
+        """Stream orders created in [start, end) in the given format"""
+        orders = OrderService.iter_orders(start=start, end=end, status=status)
+        if fmt == "csv":
+            return ExportService.orders_csv(orders)
+        return ExportService.orders_ndjson(orders)
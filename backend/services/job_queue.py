@@ -0,0 +1,171 @@
+import asyncio
+import inspect
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted to a queue that is at capacity"""
+
+
+class StageStats:
+    """Counters and a bounded latency window for one job name"""
+
+    def __init__(self, window: int = 1000):
+        self.completed = 0
+        self.failed = 0
+        self.retried = 0
+        self.latencies: Deque[float] = deque(maxlen=window)
+
+    def as_dict(self) -> dict:
+        latencies = sorted(self.latencies)
+        if latencies:
+            p50 = latencies[len(latencies) // 2]
+            p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        else:
+            p50 = p95 = 0.0
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "retried": self.retried,
+            "latency_ms_p50": round(p50 * 1000, 3),
+            "latency_ms_p95": round(p95 * 1000, 3),
+        }
+
+
+class JobQueue:
+    """In-process async job queue with a bounded worker pool and retries.
+
+    Jobs are plain callables (sync or async). A failing job is retried with
+    exponential backoff up to `max_retries` times; after that `on_failure`
+    is called, if given, so the caller can compensate.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        workers: int = 4,
+        maxsize: int = 10000,
+        max_retries: int = 3,
+        retry_backoff: float = 0.1,
+    ):
+        self.name = name
+        self.workers = workers
+        self.maxsize = maxsize
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._in_flight = 0
+        self._stats: Dict[str, StageStats] = {}
+
+    def _get_queue(self) -> asyncio.Queue:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.maxsize)
+        return self._queue
+
+    def submit(
+        self,
+        job_name: str,
+        func: Callable[..., Any],
+        *args: Any,
+        on_failure: Optional[Callable[[Exception], Any]] = None,
+    ):
+        """Enqueue a job without blocking; raise QueueFullError when at capacity"""
+        try:
+            self._get_queue().put_nowait((job_name, func, args, on_failure, 0))
+        except asyncio.QueueFull:
+            raise QueueFullError(f"{self.name} queue is full")
+
+    def has_capacity(self) -> bool:
+        """Whether a job can be submitted right now"""
+        return not self._get_queue().full()
+
+    async def start(self):
+        """Spawn the worker tasks on the running event loop"""
+        if self._tasks:
+            return
+        # A queue is bound to the loop its workers first wait on, and a restart
+        # in the same process runs on a new loop: start on a fresh queue and
+        # carry over jobs submitted before the workers existed.
+        queue = asyncio.Queue(maxsize=self.maxsize)
+        if self._queue is not None:
+            while not self._queue.empty():
+                queue.put_nowait(self._queue.get_nowait())
+        self._queue = queue
+        self._tasks = [
+            asyncio.create_task(self._worker(queue), name=f"{self.name}-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self, timeout: float = 5.0):
+        """Let workers drain the queue for up to `timeout` seconds, then cancel them"""
+        if not self._tasks:
+            return
+        try:
+            await asyncio.wait_for(self._get_queue().join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("%s queue stopped with %d jobs pending", self.name, self._get_queue().qsize())
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        # Undrained jobs are dropped with the queue; their owners re-derive
+        # them from persisted state on the next start
+        self._queue = None
+
+    async def _worker(self, queue: asyncio.Queue):
+        try:
+            while True:
+                job = await queue.get()
+                self._in_flight += 1
+                try:
+                    await self._run(queue, *job)
+                except Exception:
+                    logger.exception("%s job %s crashed", self.name, job[0])
+                finally:
+                    self._in_flight -= 1
+                    queue.task_done()
+        except Exception:
+            logger.exception("%s worker stopped", self.name)
+            raise
+
+    async def _run(self, queue, job_name, func, args, on_failure, attempt):
+        stats = self._stats.setdefault(job_name, StageStats())
+        start = time.perf_counter()
+        try:
+            result = func(*args)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            if attempt < self.max_retries:
+                stats.retried += 1
+                await asyncio.sleep(self.retry_backoff * (2 ** attempt))
+                try:
+                    queue.put_nowait((job_name, func, args, on_failure, attempt + 1))
+                    return
+                except asyncio.QueueFull:
+                    pass
+            stats.failed += 1
+            logger.exception("%s job %s failed after %d attempts", self.name, job_name, attempt + 1)
+            if on_failure is not None:
+                on_failure(e)
+        else:
+            stats.completed += 1
+        finally:
+            stats.latencies.append(time.perf_counter() - start)
+
+    def get_stats(self) -> dict:
+        """Queue depth, worker utilisation and per-stage latency"""
+        queue = self._get_queue()
+        return {
+            "depth": queue.qsize(),
+            "capacity": self.maxsize,
+            "workers": len(self._tasks),
+            "in_flight": self._in_flight,
+            "stages": {name: stats.as_dict() for name, stats in self._stats.items()},
+        }
@@ -0,0 +1,103 @@
+import gc
+import time
+from typing import Awaitable, Callable, Dict, List, Tuple
+from config import settings
+from services.persistence_service import PersistenceService
+
+
+class LifecycleService:
+    """Startup pipeline and readiness state for the API process.
+
+    Startup runs in two phases: *load* restores or seeds the in-memory storage,
+    then *warm-up* runs every registered step (index builds, cache priming),
+    then registered background services (job queues, sweepers) are started.
+    The process only reports ready once all of this has finished, so a load
+    balancer polling /health/ready never routes traffic to a cold worker.
+    """
+    _warmup_steps: List[Tuple[str, Callable[[], None]]] = []
+    _services: List[Tuple[str, Callable[[], Awaitable[None]], Callable[[], Awaitable[None]]]] = []
+    _timings: Dict[str, float] = {}
+    _ready = False
+    _started_at = time.time()
+
+    @staticmethod
+    def register_warmup(name: str, step: Callable[[], None]):
+        """Register a step to run in the warm-up phase, in registration order"""
+        LifecycleService._warmup_steps.append((name, step))
+
+    @staticmethod
+    def register_service(
+        name: str,
+        start: Callable[[], Awaitable[None]],
+        stop: Callable[[], Awaitable[None]]
+    ):
+        """Register a background service started after warm-up and stopped on shutdown"""
+        LifecycleService._services.append((name, start, stop))
+
+    @staticmethod
+    def record_timing(name: str, seconds: float):
+        """Record how long a startup phase took"""
+        LifecycleService._timings[name] = round(seconds * 1000, 2)
+
+    @staticmethod
+    def _timed(name: str, step: Callable[[], None]):
+        start = time.perf_counter()
+        step()
+        LifecycleService.record_timing(name, time.perf_counter() - start)
+
+    @staticmethod
+    def _load_data():
+        from services.product_service import ProductService
+
+        if PersistenceService.load():
+            return
+        ProductService.initialize_sample_products()
+        PersistenceService.snapshot()
+
+    @staticmethod
+    async def startup():
+        """Load data, run warm-up steps and mark the process ready"""
+        LifecycleService._ready = False
+        start = time.perf_counter()
+
+        # Loading and index builds allocate millions of long-lived objects. The
+        # cyclic GC would rescan them over and over while they are built and
+        # on every full collection afterwards, so pause it during startup and
+        # then move everything built so far out of its reach.
+        if settings.startup_gc_freeze:
+            gc.disable()
+        try:
+            LifecycleService._timed("load", LifecycleService._load_data)
+            for name, step in LifecycleService._warmup_steps:
+                LifecycleService._timed(f"warmup.{name}", step)
+        finally:
+            if settings.startup_gc_freeze:
+                gc.freeze()
+                gc.enable()
+        for name, start_service, _ in LifecycleService._services:
+            await start_service()
+
+        LifecycleService.record_timing("startup", time.perf_counter() - start)
+        LifecycleService._ready = True
+
+    @staticmethod
+    async def shutdown():
+        """Stop accepting traffic and flush persisted state"""
+        LifecycleService._ready = False
+        for name, _, stop_service in reversed(LifecycleService._services):
+            await stop_service()
+        PersistenceService.close()
+
+    @staticmethod
+    def is_ready() -> bool:
+        """Whether startup and warm-up have completed"""
+        return LifecycleService._ready
+
+    @staticmethod
+    def get_status() -> dict:
+        """Readiness flag, uptime and per-phase timings in milliseconds"""
+        return {
+            "ready": LifecycleService._ready,
+            "uptime_seconds": round(time.time() - LifecycleService._started_at, 1),
+            "timings_ms": dict(LifecycleService._timings),
+        }
@@ -0,0 +1,107 @@
+import logging
+from datetime import datetime
+from config import settings
+from database import in_memory_storage
+from services.job_queue import JobQueue, QueueFullError
+from services.order_service import OrderService
+
+logger = logging.getLogger(__name__)
+
+order_queue = JobQueue(
+    "orders",
+    workers=settings.order_workers,
+    maxsize=settings.order_queue_size,
+    max_retries=settings.order_job_retries,
+)
+
+
+class OrderPipeline:
+    """Post-checkout stages that run on the order queue, off the request path.
+
+    Each stage runs as its own job and enqueues the next one on success, so
+    retries and latency are tracked per stage. A stage that keeps failing
+    cancels the order.
+    """
+
+    @staticmethod
+    def commit_stock(order_id: int):
+        """Decrement stock for every item, or cancel if any item is short"""
+        order = OrderService.get_order_by_id(order_id)
+        if order is None or order["status"] != "pending":
+            return
+
+        if not OrderService.commit_stock(order_id):
+            OrderService.update_order_status(order_id, "cancelled")
+            return
+
+        OrderPipeline._next(order_id, "confirm_payment", OrderPipeline.confirm_payment)
+
+    @staticmethod
+    def confirm_payment(order_id: int):
+        """Mark the order paid (placeholder until a payment gateway is integrated)"""
+        order = OrderService.get_order_by_id(order_id)
+        if order is None or order["status"] != "pending":
+            return
+        OrderService.update_order_status(order_id, "confirmed")
+        OrderPipeline._next(order_id, "generate_invoice", OrderPipeline.generate_invoice)
+
+    @staticmethod
+    def generate_invoice(order_id: int):
+        """Attach an invoice number to the order"""
+        order = OrderService.get_order_by_id(order_id)
+        if order is None or order["status"] == "cancelled":
+            return
+        OrderService.attach_invoice(order_id, f"INV-{datetime.utcnow():%Y%m%d}-{order_id:06d}")
+        OrderPipeline._next(order_id, "send_notification", OrderPipeline.send_notification)
+
+    @staticmethod
+    def send_notification(order_id: int):
+        """Notify the customer (logged until email notifications exist)"""
+        order = OrderService.get_order_by_id(order_id)
+        if order is None:
+            return
+        logger.info("Order %s confirmed for user %s", order_id, order["user_id"])
+
+    @staticmethod
+    def _next(order_id: int, stage: str, func):
+        try:
+            order_queue.submit(stage, func, order_id, on_failure=lambda e: OrderPipeline._fail(order_id))
+        except QueueFullError:
+            # The previous stage already took effect; run this one inline rather
+            # than failing (and retrying) a stage that has succeeded.
+            func(order_id)
+
+    @staticmethod
+    def _fail(order_id: int):
+        order = OrderService.get_order_by_id(order_id)
+        if order is not None and OrderService.can_transition(order["status"], "cancelled"):
+            OrderService.update_order_status(order_id, "cancelled")
+
+    @staticmethod
+    def resume():
+        """Re-submit the remaining stages of every unfinished order.
+
+        Jobs live only in memory, so after a restart (or a shutdown that did
+        not drain the queue) restored orders would otherwise never move on.
+        The `stock_committed` flag and the invoice number tell which stages
+        already ran.
+        """
+        for order_id, order in list(in_memory_storage["orders"].items()):
+            status = order["status"]
+            if status in ("cancelled", "delivered"):
+                continue
+            if status == "pending":
+                if order.get("stock_committed"):
+                    OrderPipeline._next(order_id, "confirm_payment", OrderPipeline.confirm_payment)
+                else:
+                    OrderPipeline._next(order_id, "commit_stock", OrderPipeline.commit_stock)
+            elif not order.get("invoice_number"):
+                OrderPipeline._next(order_id, "generate_invoice", OrderPipeline.generate_invoice)
+
+    @staticmethod
+    def submit(order_id: int):
+        """Start the pipeline for a newly created order; raise QueueFullError when saturated"""
+        order_queue.submit(
+            "commit_stock", OrderPipeline.commit_stock, order_id,
+            on_failure=lambda e: OrderPipeline._fail(order_id)
+        )
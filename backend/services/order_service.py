@@ -1,37 +1,116 @@
-from typing import List, Optional
-from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterator, List, Optional
+from datetime import datetime, timezone
 from database import in_memory_storage
+from order_index import OrderIndex
+from services.persistence_service import PersistenceService
 from schemas.order import OrderCreate
 from services.cart_service import CartService
+from services.product_service import ProductService
+from services.analytics_service import AnalyticsService
+from services.recommendation_service import RecommendationService
+from services.event_service import EventService
+
+# Allowed order status transitions; statuses with no outgoing edges are final
+ORDER_STATUS_TRANSITIONS = {
+    "pending": {"confirmed", "cancelled"},
+    "confirmed": {"processing", "cancelled"},
+    "processing": {"shipped", "cancelled"},
+    "shipped": {"delivered"},
+    "delivered": set(),
+    "cancelled": set(),
+}
+
+# created_at -> order id index, kept in step with in_memory_storage["orders"]
+_order_index = OrderIndex()
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Naive UTC datetime, the form order timestamps are stored in"""
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
 
 
 class OrderService:
+    @staticmethod
+    def can_transition(current_status: str, new_status: str) -> bool:
+        """Check whether an order may move from one status to another"""
+        return new_status in ORDER_STATUS_TRANSITIONS.get(current_status, set())
+
+    @staticmethod
+    def get_item_quantities(order: dict) -> Dict[int, int]:
+        """Total quantity ordered per product"""
+        quantities: Dict[int, int] = {}
+        for item in order["items"]:
+            quantities[item["product_id"]] = quantities.get(item["product_id"], 0) + item["quantity"]
+        return quantities
+    
+    @staticmethod
+    def commit_stock(order_id: int) -> bool:
+        """Take the order's stock from the catalog, at most once per order.
+        
+        The order is flagged `stock_committed` in the same step as the stock
+        change, so a retried pipeline stage never takes the stock twice.
+        Returns False if any product is missing or short of stock.
+        """
+        order = in_memory_storage["orders"][order_id]
+        if order.get("stock_committed"):
+            return True
+        
+        def mark_committed():
+            order["stock_committed"] = True
+            PersistenceService.record_put("orders", order_id, order)
+        
+        return ProductService.commit_stock(OrderService.get_item_quantities(order), on_commit=mark_committed)
+    
     @staticmethod
     def create_order(user_id: int, order_data: OrderCreate) -> dict:
-        """Create a new order"""
+        """Create a new pending order and hand it to the order pipeline"""
+        from services.order_pipeline import OrderPipeline, order_queue
+        from services.job_queue import QueueFullError
+        
+        if not order_queue.has_capacity():
+            raise QueueFullError("Order processing is at capacity, please retry shortly")
+        
+        # Price each line from the catalog at order time
+        items = []
+        for item in order_data.items:
+            product = ProductService.get_product_by_id(item.product_id)
+            if not product:
+                raise ValueError(f"Product {item.product_id} not found")
+            line = item.dict()
+            line["unit_price"] = product["price"]
+            line["category"] = product["category"]
+            items.append(line)
+        
         # Calculate total amount
-        total_amount = sum(
-            item["quantity"] * 100.0  # Placeholder price calculation
-            for item in order_data.items
-        )
+        total_amount = sum(line["quantity"] * line["unit_price"] for line in items)
         
         # Create order
         order_id = len(in_memory_storage["orders"]) + 1
         order_dict = {
             "id": order_id,
             "user_id": user_id,
-            "items": [item.dict() for item in order_data.items],
+            "items": items,
             "total_amount": total_amount,
             "status": "pending",
             "shipping_address": order_data.shipping_address,
-            "created_at": datetime.utcnow().isoformat()
+            "created_at": datetime.utcnow()
         }
         
         in_memory_storage["orders"][order_id] = order_dict
+        _order_index.add(order_id, order_dict["created_at"])
+        PersistenceService.record_put("orders", order_id, order_dict)
+        AnalyticsService.record_order(order_dict)
+        RecommendationService.record_order(order_dict)
         
         # Clear user's cart after successful order
         CartService.clear_cart(user_id)
         
+        # Stock commit, payment, invoice and notification run in the background
+        OrderPipeline.submit(order_id)
+        
         return order_dict
     
     @staticmethod
@@ -54,19 +133,73 @@ class OrderService:
     
     @staticmethod
     def update_order_status(order_id: int, status: str) -> Optional[dict]:
-        """Update order status"""
+        """Update order status, enforcing the order state machine"""
         if order_id not in in_memory_storage["orders"]:
             return None
         
         order = in_memory_storage["orders"][order_id]
+        if status not in ORDER_STATUS_TRANSITIONS:
+            raise ValueError(f"Unknown order status: {status}")
+        if not OrderService.can_transition(order["status"], status):
+            raise ValueError(f"Cannot change order status from {order['status']} to {status}")
+        
+        old_status = order["status"]
         order["status"] = status
-        order["updated_at"] = datetime.utcnow().isoformat()
+        order["updated_at"] = datetime.utcnow()
+        if status == "cancelled" and order.get("stock_committed"):
+            # Put back what the pipeline took for this order
+            order["stock_committed"] = False
+            ProductService.restock(OrderService.get_item_quantities(order))
+        PersistenceService.record_put("orders", order_id, order)
+        AnalyticsService.record_status_change(order, old_status, status)
+        RecommendationService.record_status_change(order, old_status, status)
+        EventService.publish_order_status(order)
+        
+        return order
+    
+    @staticmethod
+    def attach_invoice(order_id: int, invoice_number: str) -> Optional[dict]:
+        """Record the invoice number generated for an order"""
+        order = in_memory_storage["orders"].get(order_id)
+        if order is None:
+            return None
         
+        order["invoice_number"] = invoice_number
+        PersistenceService.record_put("orders", order_id, order)
         return order
     
     @staticmethod
     def get_all_orders(skip: int = 0, limit: int = 100) -> List[dict]:
-        """Get all orders (admin function)"""
-        orders = list(in_memory_storage["orders"].values())
-        orders.sort(key=lambda x: x["created_at"], reverse=True)
-        return orders[skip:skip + limit]
\ No newline at end of file
+        """Get all orders, newest first (admin function)"""
+        order_ids = _order_index.range(newest_first=True)
+        orders = in_memory_storage["orders"]
+        return [orders[order_id] for order_id in islice(order_ids, skip, skip + limit)]
+    
+    @staticmethod
+    def iter_orders(
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        status: Optional[str] = None,
+    ) -> Iterator[dict]:
+        """Lazily yield orders created in [start, end), oldest first, optionally by status"""
+        orders = in_memory_storage["orders"]
+        for order_id in _order_index.range(_as_utc(start), _as_utc(end)):
+            order = orders.get(order_id)
+            if order is not None and (status is None or order["status"] == status):
+                yield order
+    
+    @staticmethod
+    def rebuild_index():
+        """Rebuild the created_at index from storage.
+        
+        Orders persisted before timestamps were stored as datetimes carry ISO
+        strings; they are converted in place.
+        """
+        for order in in_memory_storage["orders"].values():
+            for field in ("created_at", "updated_at"):
+                if isinstance(order.get(field), str):
+                    order[field] = datetime.fromisoformat(order[field])
+        _order_index.rebuild(
+            (order_id, order["created_at"])
+            for order_id, order in in_memory_storage["orders"].items()
+        )
\ No newline at end of file
@@ -0,0 +1,326 @@
+import asyncio
+import logging
+import mmap
+import os
+import pickle
+import shutil
+import struct
+import zlib
+from itertools import islice
+from typing import Any, Optional
+from config import settings
+from database import in_memory_storage
+
+logger = logging.getLogger(__name__)
+
+# Every log record is a fixed header (payload length, crc32) followed by a
+# pickled (op, collection, key, value) tuple. Puts always carry the full value,
+# so replaying a record twice is harmless.
+RECORD_HEADER = struct.Struct("<II")
+# A snapshot is the magic followed by a series of pickled (collection, entries)
+# chunks. Pickling in chunks keeps each pickler's memo small, so a snapshot
+# written from a worker thread never holds the GIL for long.
+SNAPSHOT_MAGIC = b"TTVSNAP2"
+LEGACY_SNAPSHOT_MAGIC = b"TTVSNAP1"  # one pickle of the whole state
+SNAPSHOT_CHUNK = 10000  # entries per pickle
+SNAPSHOT_FILE = "snapshot.bin"
+LOG_FILE = "mutations.log"
+# The log being compacted by a background snapshot; replayed before LOG_FILE
+ROTATED_LOG_FILE = "mutations.log.1"
+
+OP_PUT = 1
+OP_DELETE = 2
+
+
+class PersistenceService:
+    _log = None
+    _records_since_snapshot = 0
+    _snapshot_due: Optional[asyncio.Event] = None
+    _snapshotter: Optional[asyncio.Task] = None
+    _writing: Optional[asyncio.Future] = None
+
+    @staticmethod
+    def is_enabled() -> bool:
+        """Whether durability mode is turned on"""
+        return settings.persistence_enabled
+
+    @staticmethod
+    def _path(name: str) -> str:
+        return os.path.join(settings.data_dir, name)
+
+    @staticmethod
+    def _open_log():
+        if PersistenceService._log is None:
+            os.makedirs(settings.data_dir, exist_ok=True)
+            PersistenceService._log = open(PersistenceService._path(LOG_FILE), "ab")
+        return PersistenceService._log
+
+    @staticmethod
+    def _append(op: int, collection: str, key: Any, value: Any = None):
+        if not settings.persistence_enabled:
+            return
+
+        payload = pickle.dumps((op, collection, key, value), protocol=pickle.HIGHEST_PROTOCOL)
+        log = PersistenceService._open_log()
+        log.write(RECORD_HEADER.pack(len(payload), zlib.crc32(payload)))
+        log.write(payload)
+        log.flush()
+        if settings.persistence_fsync:
+            os.fsync(log.fileno())
+
+        PersistenceService._records_since_snapshot += 1
+        if PersistenceService._records_since_snapshot >= settings.snapshot_every:
+            if PersistenceService._snapshot_due is not None:
+                PersistenceService._snapshot_due.set()
+            else:
+                # No background snapshotter (scripts, benchmarks): compact inline
+                PersistenceService.snapshot()
+
+    @staticmethod
+    def record_put(collection: str, key: Any, value: Any):
+        """Append the new value of a storage entry to the mutation log"""
+        PersistenceService._append(OP_PUT, collection, key, value)
+
+    @staticmethod
+    def record_delete(collection: str, key: Any):
+        """Append the removal of a storage entry to the mutation log"""
+        PersistenceService._append(OP_DELETE, collection, key)
+
+    @staticmethod
+    def _write_snapshot(state: dict):
+        """Write {collection name: mapping} as a snapshot file"""
+        os.makedirs(settings.data_dir, exist_ok=True)
+        tmp_path = PersistenceService._path(SNAPSHOT_FILE + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(SNAPSHOT_MAGIC)
+            for name, entries in state.items():
+                entries = iter(entries.items())
+                while True:
+                    chunk = dict(islice(entries, SNAPSHOT_CHUNK))
+                    pickle.dump((name, chunk), f, protocol=pickle.HIGHEST_PROTOCOL)
+                    if len(chunk) < SNAPSHOT_CHUNK:
+                        break
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, PersistenceService._path(SNAPSHOT_FILE))
+
+    @staticmethod
+    def snapshot():
+        """Write the full storage to a new snapshot and truncate the log"""
+        if not settings.persistence_enabled:
+            return
+
+        PersistenceService._write_snapshot(in_memory_storage)
+
+        # A crash before the truncate only means the tail is replayed again on
+        # top of a snapshot that already contains it, which is idempotent.
+        if PersistenceService._log is not None:
+            PersistenceService._log.close()
+        PersistenceService._log = open(PersistenceService._path(LOG_FILE), "wb")
+        if os.path.exists(PersistenceService._path(ROTATED_LOG_FILE)):
+            os.remove(PersistenceService._path(ROTATED_LOG_FILE))
+        PersistenceService._records_since_snapshot = 0
+
+    @staticmethod
+    def _rotate_log():
+        """Move the current log aside and start a new one"""
+        if PersistenceService._log is not None:
+            PersistenceService._log.close()
+            PersistenceService._log = None
+        log_path = PersistenceService._path(LOG_FILE)
+        rotated_path = PersistenceService._path(ROTATED_LOG_FILE)
+        if os.path.exists(log_path):
+            if os.path.exists(rotated_path):
+                # An earlier background snapshot failed; keep its records first
+                with open(log_path, "rb") as src, open(rotated_path, "ab") as dst:
+                    shutil.copyfileobj(src, dst)
+                os.remove(log_path)
+            else:
+                os.replace(log_path, rotated_path)
+        PersistenceService._open_log()
+
+    @staticmethod
+    def _copy_collection(collection) -> Any:
+        if hasattr(collection, "current"):
+            # Published catalog snapshots are immutable and safe to read off the loop
+            return collection.current()
+        if hasattr(collection, "snapshot_view"):
+            # Spilled carts are only listed here and read in the worker thread
+            return collection.snapshot_view()
+        if type(collection) is dict:
+            return dict(collection)
+        return dict(collection.items())
+
+    @staticmethod
+    def _write_snapshot_from(state: dict):
+        # Values are shared with the live storage, and an order gaining a field
+        # while it is pickled makes pickle raise; writing again is safe because
+        # every change since the copy is in the new log anyway.
+        for attempt in range(3):
+            try:
+                PersistenceService._write_snapshot(state)
+                return
+            except RuntimeError:
+                if attempt == 2:
+                    raise
+
+    @staticmethod
+    async def snapshot_in_background():
+        """Write a snapshot without stalling the event loop.
+
+        The log is rotated first, so records written while the snapshot is
+        taken land in the new log and are replayed on top of it. Collections
+        are copied on the loop; pickling and fsync run in a worker thread.
+        """
+        if not settings.persistence_enabled:
+            return
+
+        PersistenceService._rotate_log()
+        PersistenceService._records_since_snapshot = 0
+        collections = {
+            name: PersistenceService._copy_collection(collection)
+            for name, collection in in_memory_storage.items()
+        }
+        loop = asyncio.get_running_loop()
+        PersistenceService._writing = loop.run_in_executor(
+            None, PersistenceService._write_snapshot_from, collections
+        )
+        try:
+            await asyncio.shield(PersistenceService._writing)
+        finally:
+            PersistenceService._writing = None
+        if os.path.exists(PersistenceService._path(ROTATED_LOG_FILE)):
+            os.remove(PersistenceService._path(ROTATED_LOG_FILE))
+
+    @staticmethod
+    async def _snapshot_when_due():
+        while True:
+            await PersistenceService._snapshot_due.wait()
+            PersistenceService._snapshot_due.clear()
+            try:
+                await PersistenceService.snapshot_in_background()
+            except Exception:
+                logger.exception("Background snapshot failed")
+
+    @staticmethod
+    async def start_snapshotter():
+        """Take snapshots in the background once `snapshot_every` records are logged"""
+        if PersistenceService._snapshotter is None and settings.persistence_enabled:
+            PersistenceService._snapshot_due = asyncio.Event()
+            PersistenceService._snapshotter = asyncio.create_task(
+                PersistenceService._snapshot_when_due(), name="persistence-snapshotter"
+            )
+
+    @staticmethod
+    async def stop_snapshotter():
+        if PersistenceService._snapshotter is not None:
+            PersistenceService._snapshotter.cancel()
+            await asyncio.gather(PersistenceService._snapshotter, return_exceptions=True)
+            # Let a write already in the worker thread finish before the
+            # shutdown snapshot reuses its temporary file
+            if PersistenceService._writing is not None:
+                await asyncio.gather(PersistenceService._writing, return_exceptions=True)
+            PersistenceService._snapshotter = None
+            PersistenceService._snapshot_due = None
+
+    @staticmethod
+    def _load_snapshot() -> dict:
+        path = PersistenceService._path(SNAPSHOT_FILE)
+        if not os.path.exists(path) or os.path.getsize(path) <= len(SNAPSHOT_MAGIC):
+            return {}
+
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                magic = mm[:len(SNAPSHOT_MAGIC)]
+                if magic == LEGACY_SNAPSHOT_MAGIC:
+                    with memoryview(mm)[len(SNAPSHOT_MAGIC):] as view:
+                        return pickle.loads(view)
+                if magic != SNAPSHOT_MAGIC:
+                    raise ValueError(f"{path} is not a Tattvam snapshot")
+
+                state = {}
+                mm.seek(len(SNAPSHOT_MAGIC))
+                while mm.tell() < len(mm):
+                    name, chunk = pickle.load(mm)
+                    state.setdefault(name, {}).update(chunk)
+                return state
+
+    @staticmethod
+    def _replay_log(state: dict) -> int:
+        return sum(
+            PersistenceService._replay_file(PersistenceService._path(name), state)
+            for name in (ROTATED_LOG_FILE, LOG_FILE)
+        )
+
+    @staticmethod
+    def _replay_file(path: str, state: dict) -> int:
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return 0
+
+        replayed = 0
+        offset = 0
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                size = len(mm)
+                while offset + RECORD_HEADER.size <= size:
+                    length, crc = RECORD_HEADER.unpack_from(mm, offset)
+                    start = offset + RECORD_HEADER.size
+                    end = start + length
+                    if end > size:
+                        break
+                    payload = mm[start:end]
+                    if zlib.crc32(payload) != crc:
+                        break
+
+                    op, collection, key, value = pickle.loads(payload)
+                    target = state.setdefault(collection, {})
+                    if op == OP_PUT:
+                        target[key] = value
+                    elif op == OP_DELETE:
+                        target.pop(key, None)
+
+                    replayed += 1
+                    offset = end
+
+        # Drop a torn record left by a crash mid-write so new appends stay aligned
+        if offset < os.path.getsize(path):
+            with open(path, "r+b") as f:
+                f.truncate(offset)
+
+        return replayed
+
+    @staticmethod
+    def load() -> bool:
+        """Restore storage from the latest snapshot plus the log tail.
+
+        Returns True if any persisted state was found.
+        """
+        if not settings.persistence_enabled:
+            return False
+
+        # Replay into plain dicts, then install each collection in one step
+        state = PersistenceService._load_snapshot()
+        restored = bool(state)
+        replayed = PersistenceService._replay_log(state)
+        PersistenceService._records_since_snapshot = replayed
+
+        for name, entries in state.items():
+            collection = in_memory_storage.setdefault(name, {})
+            if hasattr(collection, "replace_all"):
+                collection.replace_all(entries)
+            else:
+                collection.clear()
+                collection.update(entries)
+        return restored or replayed > 0
+
+    @staticmethod
+    def close(snapshot: bool = True):
+        """Flush state on shutdown, optionally compacting into a snapshot"""
+        if not settings.persistence_enabled:
+            return
+
+        if snapshot:
+            PersistenceService.snapshot()
+        if PersistenceService._log is not None:
+            PersistenceService._log.close()
+            PersistenceService._log = None
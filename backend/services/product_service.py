@@ -1,7 +1,18 @@
-from typing import List, Optional
+import heapq
+from typing import Callable, Dict, Iterable, List, Optional
+from datetime import datetime
 from database import in_memory_storage
+from services.persistence_service import PersistenceService
+from services.suggest_service import SuggestService
+from services.search_service import SearchService
+from services.event_service import EventService
 from schemas.product import ProductCreate, ProductUpdate
 
+# Derived catalog views (category list, featured products) keyed by name and
+# tagged with the snapshot version they were built from. A published snapshot
+# never changes, so an entry is valid until the catalog version moves on.
+_fragment_cache: Dict[str, tuple] = {}
+
 
 class ProductService:
     @staticmethod
@@ -9,16 +20,29 @@ class ProductService:
         category: Optional[str] = None, 
         search: Optional[str] = None,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        fuzzy: bool = False
     ) -> List[dict]:
         """Get products with optional filtering"""
-        products = list(in_memory_storage["products"].values())
+        catalog = in_memory_storage["products"].current()
+        if search and fuzzy:
+            SuggestService.record_query(search)
+            # Ranked by match quality rather than catalog order
+            products = [
+                catalog.get(product_id)
+                for product_id in SearchService.search(search)
+                if product_id in catalog
+            ]
+            search = None
+        else:
+            products = list(catalog.values())
         
         # Apply filters
         if category:
             products = [p for p in products if p["category"].lower() == category.lower()]
         
         if search:
+            SuggestService.record_query(search)
             search_lower = search.lower()
             products = [p for p in products if 
                        search_lower in p["name"].lower() or 
@@ -32,13 +56,41 @@ class ProductService:
         """Get product by ID"""
         return in_memory_storage["products"].get(product_id)
     
+    @staticmethod
+    def get_catalog_version() -> int:
+        """Version of the currently published catalog snapshot"""
+        return in_memory_storage["products"].version
+    
+    @staticmethod
+    def _cached_fragment(name: str, build: Callable) -> tuple:
+        """Build a catalog-derived value once per catalog version"""
+        catalog = in_memory_storage["products"].current()
+        cached = _fragment_cache.get(name)
+        if cached is not None and cached[0] == catalog.version:
+            return cached[1]
+        value = tuple(build(catalog))
+        _fragment_cache[name] = (catalog.version, value)
+        return value
+    
     @staticmethod
     def get_categories() -> List[str]:
         """Get all product categories"""
-        categories = set()
-        for product in in_memory_storage["products"].values():
-            categories.add(product["category"])
-        return list(categories)
+        return list(ProductService._cached_fragment(
+            "categories",
+            lambda catalog: {product["category"] for product in catalog.values()},
+        ))
+    
+    @staticmethod
+    def get_featured_products(limit: int = 8) -> List[dict]:
+        """Get the top-rated active products"""
+        return list(ProductService._cached_fragment(
+            f"featured:{limit}",
+            lambda catalog: heapq.nlargest(
+                limit,
+                (p for p in catalog.values() if p.get("is_active", True)),
+                key=lambda p: p.get("rating", 0.0),
+            ),
+        ))
     
     @staticmethod
     def create_product(product_data: ProductCreate) -> dict:
@@ -49,8 +101,13 @@ class ProductService:
         product_dict["rating"] = 0.0
         product_dict["reviews_count"] = 0
         product_dict["is_active"] = True
+        product_dict["created_at"] = datetime.utcnow().isoformat()
         
         in_memory_storage["products"][product_id] = product_dict
+        product_dict = in_memory_storage["products"][product_id]
+        PersistenceService.record_put("products", product_id, product_dict)
+        SuggestService.index_product(product_dict)
+        SearchService.index_product(product_dict)
         return product_dict
     
     @staticmethod
@@ -59,19 +116,78 @@ class ProductService:
         if product_id not in in_memory_storage["products"]:
             return None
         
+        # Published products are immutable: build the new version from a copy
+        current = in_memory_storage["products"][product_id]
+        previous_category = current["category"]
+        product = current.copy()
+        product.update(product_data.dict(exclude_unset=True))
+        product["updated_at"] = datetime.utcnow().isoformat()
+        
+        in_memory_storage["products"][product_id] = product
         product = in_memory_storage["products"][product_id]
-        update_data = product_data.dict(exclude_unset=True)
+        PersistenceService.record_put("products", product_id, product)
+        SuggestService.index_product(product, previous_category=previous_category)
+        SearchService.index_product(product)
+        if product["stock"] != current["stock"] or product["price"] != current["price"]:
+            EventService.publish_product_change(product)
+        return product
+    
+    @staticmethod
+    def commit_stock(quantities: Dict[int, int], on_commit: Optional[Callable[[], None]] = None) -> bool:
+        """Decrement stock for several products as one catalog version.
         
-        for field, value in update_data.items():
-            product[field] = value
+        Returns False without changing anything if any product is missing
+        or short of stock. `on_commit` runs as soon as the new stock is
+        published, before it is logged and announced, so a caller can record
+        that the stock was taken even if a later step fails.
+        """
+        store = in_memory_storage["products"]
+        catalog = store.current()
+        updated = {}
+        for product_id, quantity in quantities.items():
+            product = catalog.get(product_id)
+            if product is None or product["stock"] < quantity:
+                return False
+            updated[product_id] = {**product, "stock": product["stock"] - quantity}
         
-        return product
+        catalog = store.publish(updated)
+        if on_commit is not None:
+            on_commit()
+        ProductService._announce_stock(catalog, updated)
+        return True
+    
+    @staticmethod
+    def restock(quantities: Dict[int, int]):
+        """Return stock taken by `commit_stock`, as one catalog version.
+        
+        Products deleted in the meantime are skipped.
+        """
+        store = in_memory_storage["products"]
+        catalog = store.current()
+        updated = {}
+        for product_id, quantity in quantities.items():
+            product = catalog.get(product_id)
+            if product is not None:
+                updated[product_id] = {**product, "stock": product["stock"] + quantity}
+        if updated:
+            ProductService._announce_stock(store.publish(updated), updated)
+    
+    @staticmethod
+    def _announce_stock(catalog, product_ids: Iterable[int]):
+        """Log and publish the new stock of products in a published catalog"""
+        for product_id in product_ids:
+            product = catalog.get(product_id)
+            PersistenceService.record_put("products", product_id, product)
+            EventService.publish_product_change(product)
     
     @staticmethod
     def delete_product(product_id: int) -> bool:
         """Delete a product"""
         if product_id in in_memory_storage["products"]:
-            del in_memory_storage["products"][product_id]
+            product = in_memory_storage["products"].pop(product_id)
+            PersistenceService.record_delete("products", product_id)
+            SuggestService.remove_product(product)
+            SearchService.remove_product(product_id)
             return True
         return False
     
@@ -131,7 +247,11 @@ class ProductService:
             }
         ]
         
+        created_at = datetime.utcnow().isoformat()
         for i, product in enumerate(sample_products, 1):
             product["id"] = i
             product["is_active"] = True
-            in_memory_storage["products"][i] = product
\ No newline at end of file
+            product["created_at"] = created_at
+        in_memory_storage["products"].replace_all(
+            {product["id"]: product for product in sample_products}
+        )
\ No newline at end of file
@@ -0,0 +1,122 @@
+import heapq
+from typing import Dict, List, Tuple
+from config import settings
+from database import in_memory_storage
+
+# Sparse co-occurrence counts: product_id -> {other_product_id: orders containing both}.
+# Each row is capped at settings.recommendation_row_cap entries, so memory is
+# bounded by products x row cap regardless of order volume.
+_cooccurrence: Dict[int, Dict[int, int]] = {}
+
+# Precomputed top-N neighbors per product, served directly by /products/{id}/related
+_neighbors: Dict[int, List[Tuple[int, int]]] = {}
+
+
+class RecommendationService:
+    @staticmethod
+    def _basket(order: dict) -> List[int]:
+        product_ids = list(dict.fromkeys(item["product_id"] for item in order["items"]))
+        # Pair updates are quadratic in basket size, so very large baskets are truncated
+        return product_ids[:settings.recommendation_max_basket]
+
+    @staticmethod
+    def _prune(row: Dict[int, int]):
+        """Drop the weakest pairs once a row grows past its cap"""
+        if len(row) <= settings.recommendation_row_cap:
+            return
+        # Prune below the cap so newly seen pairs get room to accumulate counts
+        keep = settings.recommendation_row_cap * 3 // 4
+        strongest = heapq.nlargest(keep, row.items(), key=lambda kv: kv[1])
+        row.clear()
+        row.update(strongest)
+
+    @staticmethod
+    def _refresh_neighbors(product_id: int):
+        row = _cooccurrence.get(product_id)
+        if not row:
+            _neighbors.pop(product_id, None)
+            return
+        _neighbors[product_id] = heapq.nlargest(
+            settings.recommendation_neighbors, row.items(), key=lambda kv: (kv[1], -kv[0])
+        )
+
+    @staticmethod
+    def _add_basket(product_ids: List[int]):
+        for i, product_id in enumerate(product_ids):
+            row = _cooccurrence.setdefault(product_id, {})
+            for j, other_id in enumerate(product_ids):
+                if i != j:
+                    row[other_id] = row.get(other_id, 0) + 1
+            RecommendationService._prune(row)
+
+    @staticmethod
+    def _remove_basket(product_ids: List[int]):
+        for i, product_id in enumerate(product_ids):
+            row = _cooccurrence.get(product_id)
+            if row is None:
+                continue
+            for j, other_id in enumerate(product_ids):
+                # A pair may already have been pruned from a capped row
+                if i != j and other_id in row:
+                    row[other_id] -= 1
+                    if row[other_id] <= 0:
+                        del row[other_id]
+            if not row:
+                del _cooccurrence[product_id]
+
+    @staticmethod
+    def record_order(order: dict):
+        """Count every pair of products bought together in an order"""
+        product_ids = RecommendationService._basket(order)
+        if len(product_ids) < 2:
+            return
+        RecommendationService._add_basket(product_ids)
+        for product_id in product_ids:
+            RecommendationService._refresh_neighbors(product_id)
+
+    @staticmethod
+    def record_status_change(order: dict, old_status: str, new_status: str):
+        """Stop counting an order's pairs once it is cancelled, as rebuild() does"""
+        if new_status != "cancelled" or old_status == "cancelled":
+            return
+        product_ids = RecommendationService._basket(order)
+        if len(product_ids) < 2:
+            return
+        RecommendationService._remove_basket(product_ids)
+        for product_id in product_ids:
+            RecommendationService._refresh_neighbors(product_id)
+
+    @staticmethod
+    def rebuild():
+        """Recompute co-occurrence and neighbor lists from all non-cancelled orders"""
+        _cooccurrence.clear()
+        _neighbors.clear()
+        for order in list(in_memory_storage["orders"].values()):
+            if order["status"] == "cancelled":
+                continue
+            product_ids = RecommendationService._basket(order)
+            if len(product_ids) >= 2:
+                RecommendationService._add_basket(product_ids)
+        for product_id in list(_cooccurrence):
+            RecommendationService._refresh_neighbors(product_id)
+
+    @staticmethod
+    def get_related_products(product_id: int, limit: int = 4) -> List[dict]:
+        """Get products most frequently bought together with the given product"""
+        related = []
+        for other_id, _ in _neighbors.get(product_id, []):
+            product = in_memory_storage["products"].get(other_id)
+            if product is not None:
+                related.append(product)
+                if len(related) >= limit:
+                    break
+        return related
+
+    @staticmethod
+    def get_stats() -> dict:
+        """Size of the co-occurrence matrix"""
+        return {
+            "products": len(_cooccurrence),
+            "pairs": sum(len(row) for row in _cooccurrence.values()),
+            "row_cap": settings.recommendation_row_cap,
+        }
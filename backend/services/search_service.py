@@ -0,0 +1,216 @@
+import heapq
+import json
+import math
+import re
+from typing import Dict, Iterable, List, Set, Tuple
+from config import settings
+from database import in_memory_storage
+from services.suggest_service import normalize
+
+# Spelling groups common in Indian product names. Each group is a set of
+# interchangeable words; any member of a query expands to the whole group.
+DEFAULT_SYNONYMS = [
+    ["kanjeevaram", "kanjivaram", "kancheepuram", "kanchipuram", "kanchi"],
+    ["haldi", "turmeric"],
+    ["jeera", "cumin"],
+    ["elaichi", "cardamom"],
+    ["chawal", "rice"],
+    ["saree", "sari"],
+    ["diya", "deepam", "lamp"],
+    ["agarbatti", "incense", "dhoop"],
+    ["masala", "spice", "spices"],
+    ["pital", "brass"],
+    ["chai", "tea"],
+    ["kurta", "kurti"],
+]
+
+# Transliteration variants folded to a single spelling before n-gramming,
+# e.g. "kanjeevaram" and "kanjivaram" both become "kanjivaram".
+_FOLDS = [
+    (re.compile(r"ee|ii"), "i"),
+    (re.compile(r"oo|uu"), "u"),
+    (re.compile(r"aa"), "a"),
+    (re.compile(r"([bcdgjkpt])h"), r"\1"),
+    (re.compile(r"sh"), "s"),
+    (re.compile(r"w"), "v"),
+    (re.compile(r"z"), "j"),
+    (re.compile(r"(.)\1+"), r"\1"),
+]
+
+
+def fold(word: str) -> str:
+    """Reduce a normalized word to a transliteration-insensitive spelling"""
+    for pattern, replacement in _FOLDS:
+        word = pattern.sub(replacement, word)
+    return word
+
+
+def trigrams(word: str) -> Set[str]:
+    """Character trigrams of a word padded with boundary markers"""
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _load_synonyms() -> Dict[str, Set[str]]:
+    groups = [list(group) for group in DEFAULT_SYNONYMS]
+    path = settings.search_synonyms_file
+    if path:
+        with open(path) as f:
+            try:
+                extra = json.load(f)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path} is not valid JSON: {e}")
+        # A bare string would otherwise be split into single-letter synonyms
+        if not isinstance(extra, list) or not all(
+            isinstance(group, list) and all(isinstance(word, str) for word in group)
+            for group in extra
+        ):
+            raise ValueError(f"{path} must be a JSON list of synonym groups (lists of strings)")
+        groups.extend(extra)
+
+    synonyms: Dict[str, Set[str]] = {}
+    for group in groups:
+        members = {fold(word) for phrase in group for word in normalize(phrase).split()}
+        for member in members:
+            synonyms.setdefault(member, set()).update(members)
+    return synonyms
+
+
+# Vocabulary index: folded token -> product ids, trigram -> tokens containing it.
+# Fuzzy matching runs over the vocabulary, which grows far slower than the
+# catalog, and only then fans out to products.
+_token_products: Dict[str, Set[int]] = {}
+_gram_tokens: Dict[str, Set[str]] = {}
+_product_tokens: Dict[int, Set[str]] = {}
+_synonyms: Dict[str, Set[str]] = {}
+
+
+class SearchService:
+    @staticmethod
+    def _tokens(product: dict) -> Set[str]:
+        text = " ".join((product["name"], product["category"], product.get("description", "")))
+        return {fold(word) for word in normalize(text).split()}
+
+    @staticmethod
+    def _add_token(token: str, product_id: int):
+        products = _token_products.get(token)
+        if products is None:
+            products = _token_products[token] = set()
+            for gram in trigrams(token):
+                _gram_tokens.setdefault(gram, set()).add(token)
+        products.add(product_id)
+
+    @staticmethod
+    def _remove_token(token: str, product_id: int):
+        products = _token_products.get(token)
+        if products is None:
+            return
+        products.discard(product_id)
+        if products:
+            return
+        del _token_products[token]
+        for gram in trigrams(token):
+            tokens = _gram_tokens.get(gram)
+            if tokens is not None:
+                tokens.discard(token)
+                if not tokens:
+                    del _gram_tokens[gram]
+
+    @staticmethod
+    def index_product(product: dict):
+        """Add or refresh a product in the fuzzy index"""
+        product_id = product["id"]
+        new_tokens = SearchService._tokens(product)
+        old_tokens = _product_tokens.get(product_id, set())
+        for token in old_tokens - new_tokens:
+            SearchService._remove_token(token, product_id)
+        for token in new_tokens - old_tokens:
+            SearchService._add_token(token, product_id)
+        _product_tokens[product_id] = new_tokens
+
+    @staticmethod
+    def remove_product(product_id: int):
+        """Remove a deleted product from the fuzzy index"""
+        for token in _product_tokens.pop(product_id, set()):
+            SearchService._remove_token(token, product_id)
+
+    @staticmethod
+    def rebuild():
+        """Rebuild the fuzzy index and reload the synonym table"""
+        _token_products.clear()
+        _gram_tokens.clear()
+        _product_tokens.clear()
+        _synonyms.clear()
+        _synonyms.update(_load_synonyms())
+        for product in list(in_memory_storage["products"].values()):
+            SearchService.index_product(product)
+
+    @staticmethod
+    def _similar_tokens(word: str) -> List[Tuple[str, float]]:
+        """Vocabulary tokens whose trigram Dice similarity to `word` passes the threshold"""
+        query_grams = trigrams(word)
+        threshold = settings.search_min_similarity
+
+        # Dice >= t needs at least this many shared grams even against the
+        # shortest possible token, so a match must share one of the
+        # (len - needed + 1) rarest grams. Only those grams generate candidates.
+        needed = max(1, math.ceil(threshold * len(query_grams) / (2 - threshold)))
+        by_rarity = sorted(query_grams, key=lambda gram: len(_gram_tokens.get(gram, ())))
+        candidates: Set[str] = set()
+        for gram in by_rarity[:len(by_rarity) - needed + 1]:
+            candidates.update(_gram_tokens.get(gram, ()))
+
+        matches = []
+        for token in candidates:
+            token_grams = trigrams(token)
+            similarity = 2 * len(query_grams & token_grams) / (len(query_grams) + len(token_grams))
+            if similarity >= threshold:
+                matches.append((token, similarity))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches[:settings.search_max_token_matches]
+
+    @staticmethod
+    def _expand(word: str) -> Iterable[str]:
+        folded = fold(word)
+        return _synonyms.get(folded, {folded})
+
+    @staticmethod
+    def _word_matches(word: str) -> Dict[int, float]:
+        """Best similarity per product for one query word, over all its variants"""
+        matches = []
+        for variant in SearchService._expand(word):
+            matches.extend(SearchService._similar_tokens(variant))
+        # Apply weakest matches first so dict.update keeps each product's best
+        matches.sort(key=lambda match: match[1])
+        best: Dict[int, float] = {}
+        for token, similarity in matches:
+            best.update(dict.fromkeys(_token_products[token], similarity))
+        return best
+
+    @staticmethod
+    def search(query: str) -> List[int]:
+        """Rank product ids by how well they fuzzily match every query word"""
+        words = list(dict.fromkeys(normalize(query).split()))
+        if not words:
+            return []
+
+        per_word = sorted((SearchService._word_matches(word) for word in words), key=len)
+        limit = settings.search_max_results
+
+        def score(product_id: int) -> float:
+            return sum(matches.get(product_id, 0.0) for matches in per_word)
+
+        # Products matching every word rank first, by total similarity
+        full = set(per_word[0])
+        for matches in per_word[1:]:
+            full.intersection_update(matches)
+        ranked = heapq.nlargest(limit, full, key=score)
+        if len(ranked) >= limit or len(per_word) == 1:
+            return ranked
+
+        # Then partial matches, by number of words matched and similarity
+        def words_matched(product_id: int) -> tuple:
+            return sum(product_id in matches for matches in per_word), score(product_id)
+
+        partial = set().union(*per_word) - full
+        return ranked + heapq.nlargest(limit - len(ranked), partial, key=words_matched)
@@ -0,0 +1,272 @@
+import math
+import re
+from typing import Dict, List, Optional, Set, Tuple
+from config import settings
+from database import in_memory_storage
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase and collapse punctuation/whitespace to single spaces"""
+    return _NON_ALNUM.sub(" ", text.lower()).strip()
+
+
+class _TrieNode:
+    __slots__ = ("children", "terms", "top")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.terms: Set[str] = set()  # ids of terms with a key ending here
+        self.top: List[Tuple[float, str]] = []  # best (score, term id) in this subtree
+
+
+# Prefix trie over suggestion keys. Every node caches the top-k terms of its
+# subtree, so a lookup is a walk down the query's characters plus a slice.
+# Keys are cut at settings.suggest_max_key_length characters to keep the node
+# count down; the rare longer query filters the terms stored at that depth.
+_root = _TrieNode()
+
+# term id -> {"text", "type", "product_id", "score", "keys"}
+_terms: Dict[str, dict] = {}
+
+# category name (normalized) -> number of products in it
+_category_counts: Dict[str, int] = {}
+
+# normalized search query -> number of times it was searched
+_query_counts: Dict[str, int] = {}
+
+
+class SuggestService:
+    @staticmethod
+    def _keys(text: str) -> List[str]:
+        """Index a term under its full text and under each later word onward"""
+        words = normalize(text).split()
+        return [" ".join(words[i:]) for i in range(len(words))]
+
+    @staticmethod
+    def _recompute(node: _TrieNode):
+        if not node.terms and len(node.children) == 1:
+            # Chain node: its subtree is its only child's (tops are replaced, never mutated)
+            node.top = next(iter(node.children.values())).top
+            return
+        best: Dict[str, float] = {}
+        for term_id in node.terms:
+            best[term_id] = _terms[term_id]["score"]
+        for child in node.children.values():
+            for score, term_id in child.top:
+                if score > best.get(term_id, -math.inf):
+                    best[term_id] = score
+        node.top = sorted(
+            ((score, term_id) for term_id, score in best.items()), reverse=True
+        )[:settings.suggest_cache_size]
+
+    @staticmethod
+    def _path(key: str, create: bool) -> Optional[List[_TrieNode]]:
+        node = _root
+        path = [node]
+        for char in key:
+            child = node.children.get(char)
+            if child is None:
+                if not create:
+                    return None
+                child = node.children[char] = _TrieNode()
+            node = child
+            path.append(node)
+        return path
+
+    @staticmethod
+    def _refresh(path: List[_TrieNode]):
+        for node in reversed(path):
+            SuggestService._recompute(node)
+
+    @staticmethod
+    def _insert_key(key: str, term_id: str, refresh: bool = True):
+        key = key[:settings.suggest_max_key_length]
+        path = SuggestService._path(key, create=True)
+        path[-1].terms.add(term_id)
+        if refresh:
+            SuggestService._refresh(path)
+
+    @staticmethod
+    def _remove_key(key: str, term_id: str):
+        key = key[:settings.suggest_max_key_length]
+        path = SuggestService._path(key, create=False)
+        if path is None:
+            return
+        path[-1].terms.discard(term_id)
+        # Prune branches left empty, then fix the cached tops above them
+        for depth in range(len(path) - 1, 0, -1):
+            node = path[depth]
+            if node.terms or node.children:
+                break
+            del path[depth - 1].children[key[depth - 1]]
+            path.pop()
+        SuggestService._refresh(path)
+
+    @staticmethod
+    def _put_term(
+        term_id: str,
+        text: str,
+        term_type: str,
+        score: float,
+        product_id: Optional[int] = None,
+        refresh: bool = True
+    ):
+        existing = _terms.get(term_id)
+        keys = SuggestService._keys(text)
+        if existing is not None and existing["keys"] != keys:
+            SuggestService._drop_term(term_id)
+            existing = None
+
+        _terms[term_id] = {
+            "text": text,
+            "type": term_type,
+            "product_id": product_id,
+            "score": score,
+            "keys": keys,
+        }
+        for key in keys:
+            if existing is None:
+                SuggestService._insert_key(key, term_id, refresh=refresh)
+            elif refresh:
+                SuggestService._refresh(
+                    SuggestService._path(key[:settings.suggest_max_key_length], create=False)
+                )
+
+    @staticmethod
+    def _drop_term(term_id: str):
+        term = _terms.get(term_id)
+        if term is None:
+            return
+        for key in term["keys"]:
+            SuggestService._remove_key(key, term_id)
+        del _terms[term_id]
+
+    @staticmethod
+    def _product_score(product: dict) -> float:
+        return product.get("rating", 0.0) * math.log1p(product.get("reviews_count", 0)) + 1.0
+
+    @staticmethod
+    def _category_score(product_count: int) -> float:
+        # Categories rank by how many products they hold
+        return 2.0 * math.log1p(product_count) + 5.0
+
+    @staticmethod
+    def _adjust_category(category: str, delta: int):
+        key = normalize(category)
+        count = _category_counts.get(key, 0) + delta
+        term_id = f"c:{key}"
+        if count <= 0:
+            _category_counts.pop(key, None)
+            SuggestService._drop_term(term_id)
+            return
+        _category_counts[key] = count
+        SuggestService._put_term(term_id, category, "category", SuggestService._category_score(count))
+
+    @staticmethod
+    def index_product(product: dict, previous_category: Optional[str] = None):
+        """Add or refresh a product's name and category suggestions"""
+        term_id = f"p:{product['id']}"
+        is_new = term_id not in _terms
+        SuggestService._put_term(
+            term_id, product["name"], "product",
+            SuggestService._product_score(product), product_id=product["id"]
+        )
+        if is_new:
+            SuggestService._adjust_category(product["category"], 1)
+        elif previous_category is not None and previous_category != product["category"]:
+            SuggestService._adjust_category(previous_category, -1)
+            SuggestService._adjust_category(product["category"], 1)
+
+    @staticmethod
+    def remove_product(product: dict):
+        """Remove a deleted product's suggestions"""
+        SuggestService._drop_term(f"p:{product['id']}")
+        SuggestService._adjust_category(product["category"], -1)
+
+    @staticmethod
+    def record_query(query: str):
+        """Count a search query, suggesting it once it has become popular"""
+        key = normalize(query)
+        if not key:
+            return
+        if key not in _query_counts and len(_query_counts) >= settings.suggest_max_queries:
+            return
+        count = _query_counts.get(key, 0) + 1
+        _query_counts[key] = count
+        if count >= settings.suggest_query_min_count:
+            SuggestService._put_term(f"q:{key}", key, "query", math.log1p(count))
+
+    @staticmethod
+    def rebuild():
+        """Rebuild the trie from the product catalog and recorded queries"""
+        global _root
+        _root = _TrieNode()
+        _terms.clear()
+        _category_counts.clear()
+
+        # Bulk load without per-insert refreshes, then fill every node's top-k once
+        categories = {}
+        for product in list(in_memory_storage["products"].values()):
+            SuggestService._put_term(
+                f"p:{product['id']}", product["name"], "product",
+                SuggestService._product_score(product), product_id=product["id"], refresh=False
+            )
+            key = normalize(product["category"])
+            categories.setdefault(key, product["category"])
+            _category_counts[key] = _category_counts.get(key, 0) + 1
+        for key, category in categories.items():
+            SuggestService._put_term(
+                f"c:{key}", category, "category",
+                SuggestService._category_score(_category_counts[key]), refresh=False
+            )
+        for key, count in _query_counts.items():
+            if count >= settings.suggest_query_min_count:
+                SuggestService._put_term(f"q:{key}", key, "query", math.log1p(count), refresh=False)
+
+        # Iterative post-order traversal so deep tries don't hit the recursion limit
+        stack = [(_root, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if children_done:
+                SuggestService._recompute(node)
+            else:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.children.values())
+
+    @staticmethod
+    def _ranked_terms(query: str) -> List[str]:
+        max_length = settings.suggest_max_key_length
+        path = SuggestService._path(query[:max_length], create=False)
+        if path is None:
+            return []
+        node = path[-1]
+        if len(query) <= max_length:
+            return [term_id for _, term_id in node.top]
+
+        matches = [
+            term_id for term_id in node.terms
+            if any(key.startswith(query) for key in _terms[term_id]["keys"])
+        ]
+        return sorted(matches, key=lambda term_id: _terms[term_id]["score"], reverse=True)
+
+    @staticmethod
+    def suggest(query: str, limit: int = 8) -> List[dict]:
+        """Get the best-ranked suggestions starting with the query"""
+        suggestions = []
+        seen = set()
+        for term_id in SuggestService._ranked_terms(normalize(query)):
+            term = _terms[term_id]
+            text_key = term["text"].lower()
+            if text_key in seen:
+                continue
+            seen.add(text_key)
+            suggestions.append({
+                "text": term["text"],
+                "type": term["type"],
+                "product_id": term["product_id"],
+            })
+            if len(suggestions) >= limit:
+                break
+        return suggestions
@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import settings  # noqa: E402
+from database import in_memory_storage  # noqa: E402
+from services.order_service import OrderService  # noqa: E402
+from services.persistence_service import PersistenceService  # noqa: E402
+from services.product_service import ProductService  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def storage():
+    """Start every test from the sample catalog and no orders"""
+    for name in ("users", "orders", "cart"):
+        in_memory_storage[name].clear()
+    ProductService.initialize_sample_products()
+    OrderService.rebuild_index()
+    yield in_memory_storage
+
+
+@pytest.fixture
+def persistence(tmp_path, monkeypatch):
+    """Persist storage to a temporary data directory for the test"""
+    monkeypatch.setattr(settings, "persistence_enabled", True)
+    monkeypatch.setattr(settings, "data_dir", str(tmp_path))
+    yield tmp_path
+    PersistenceService.close(snapshot=False)
+    PersistenceService._records_since_snapshot = 0
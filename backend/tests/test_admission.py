@@ -0,0 +1,191 @@
+import asyncio
+import math
+
+import pytest
+from fastapi import Depends, FastAPI, Request
+from fastapi.testclient import TestClient
+
+from database import in_memory_storage
+from routers.admission import client_key
+from routers.auth import get_current_user
+from services.admission_service import ConcurrencyLimiter, OverloadedError
+from services.auth_service import AuthService
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def limiter(clock: Clock, limit: int = 1) -> ConcurrencyLimiter:
+    return ConcurrencyLimiter(limit=limit, target=0.1, interval=1.0, max_queue=10, clock=clock)
+
+
+async def settle():
+    for _ in range(3):
+        await asyncio.sleep(0)
+
+
+async def wait_then_release(limiter: ConcurrencyLimiter, clock: Clock, delay: float):
+    """Queue one request behind the holder and hand it the slot `delay` seconds later"""
+    waiter = asyncio.create_task(limiter.acquire())
+    await settle()
+    clock.now += delay
+    limiter.release()
+    await waiter
+
+
+def test_waiters_are_admitted_in_fifo_order():
+    async def scenario():
+        slots = limiter(Clock())
+        await slots.acquire()
+        order = []
+
+        async def request(name):
+            await slots.acquire()
+            order.append(name)
+
+        tasks = [asyncio.create_task(request(name)) for name in "abc"]
+        await settle()
+        assert slots.get_stats()["queued"] == 3
+        for _ in range(3):
+            slots.release()
+            await settle()
+        await asyncio.gather(*tasks)
+        assert order == ["a", "b", "c"]
+        assert slots.active == 1
+        slots.release()
+        assert slots.active == 0
+
+    asyncio.run(scenario())
+
+
+def test_sheds_only_after_a_whole_interval_above_target():
+    async def scenario():
+        clock = Clock()
+        slots = limiter(clock)
+        await slots.acquire()
+        clock.now = 1.0
+        await wait_then_release(slots, clock, 0.0)  # closes the first window, delay 0
+
+        # Delays above target for most of an interval: not yet shedding
+        for _ in range(3):
+            await wait_then_release(slots, clock, 0.3)
+            assert not slots.shedding
+        assert clock.now == pytest.approx(1.9)
+
+        # The window closes with every delay above target
+        await wait_then_release(slots, clock, 0.3)
+        assert slots.shedding
+        with pytest.raises(OverloadedError):
+            await slots.acquire()
+        assert slots.shed == 1
+
+        # A free slot is still granted while shedding
+        slots.release()
+        await slots.acquire()
+
+    asyncio.run(scenario())
+
+
+def test_one_short_delay_in_the_interval_prevents_shedding():
+    async def scenario():
+        clock = Clock()
+        slots = limiter(clock)
+        await slots.acquire()
+        clock.now = 1.0
+        await wait_then_release(slots, clock, 0.0)
+        await wait_then_release(slots, clock, 0.5)
+        await wait_then_release(slots, clock, 0.05)
+        await wait_then_release(slots, clock, 0.5)
+        assert clock.now > 2.0
+        assert not slots.shedding
+
+    asyncio.run(scenario())
+
+
+def test_retry_after_follows_measured_queue_delay():
+    async def scenario():
+        clock = Clock()
+        slots = limiter(clock)
+        await slots.acquire()
+        expected_delay = 0.0
+        for delay in (20.0, 20.0):
+            await wait_then_release(slots, clock, delay)
+            expected_delay += (delay - expected_delay) * 0.1
+        assert slots.shedding
+        assert slots.queue_delay == pytest.approx(expected_delay)
+
+        with pytest.raises(OverloadedError) as shed:
+            await slots.acquire()
+        assert shed.value.retry_after == math.ceil(expected_delay)
+        assert shed.value.retry_after > 1
+
+        # A longer backlog asks clients to wait proportionally longer
+        slots.shedding = False
+        waiting = [asyncio.create_task(slots.acquire()) for _ in range(2)]
+        await settle()
+        slots.shedding = True
+        with pytest.raises(OverloadedError) as shed:
+            await slots.acquire()
+        assert shed.value.retry_after == math.ceil(expected_delay * 3)
+        for task in waiting:
+            task.cancel()
+        await asyncio.gather(*waiting, return_exceptions=True)
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_does_not_leak_a_slot():
+    async def scenario():
+        slots = limiter(Clock())
+        await slots.acquire()
+        waiter = asyncio.create_task(slots.acquire())
+        await settle()
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+        assert slots.get_stats()["queued"] == 0
+        slots.release()
+        assert slots.active == 0
+
+    asyncio.run(scenario())
+
+
+def test_waiter_cancelled_after_the_handoff_passes_the_slot_on():
+    async def scenario():
+        slots = limiter(Clock())
+        await slots.acquire()
+        first = asyncio.create_task(slots.acquire())
+        second = asyncio.create_task(slots.acquire())
+        await settle()
+
+        slots.release()  # hands the slot to `first`...
+        first.cancel()  # ...which is cancelled before it runs
+        await asyncio.gather(first, return_exceptions=True)
+        await second
+        assert slots.active == 1
+        slots.release()
+        assert slots.active == 0
+
+    asyncio.run(scenario())
+
+
+def test_client_key_and_current_user_decode_the_token_once(monkeypatch):
+    token = AuthService.create_access_token(data={"sub": "1"})
+    decodes = []
+    verify = AuthService.verify_token
+    monkeypatch.setattr(AuthService, "verify_token", staticmethod(lambda t: decodes.append(t) or verify(t)))
+    in_memory_storage["users"][1] = {"id": 1, "email": "asha@example.in", "password": "x"}
+
+    app = FastAPI()
+
+    @app.get("/whoami")
+    async def whoami(request: Request, user: dict = Depends(get_current_user)):
+        return {"key": client_key(request), "user": user["id"]}
+
+    response = TestClient(app).get("/whoami", headers={"Authorization": f"Bearer {token}"})
+    assert response.json() == {"key": "user:1", "user": 1}
+    assert decodes == [token]
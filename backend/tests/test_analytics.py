@@ -0,0 +1,74 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+import services.order_service as order_service
+from schemas.order import OrderCreate
+from services.analytics_service import AnalyticsService
+from services.order_service import ORDER_STATUS_TRANSITIONS, OrderService
+
+
+def reports() -> dict:
+    return {
+        "summary": AnalyticsService.get_summary(),
+        "products": AnalyticsService.get_product_sales(limit=100),
+        "categories": AnalyticsService.get_category_sales(),
+        "daily": AnalyticsService.get_daily_sales(days=366),
+    }
+
+
+def test_rebuild_matches_incremental_updates(monkeypatch):
+    rng = random.Random(7)
+    now = {"value": datetime(2026, 10, 1, 9, 0)}
+
+    class Clock(datetime):
+        @classmethod
+        def utcnow(cls):
+            return now["value"]
+
+    monkeypatch.setattr(order_service, "datetime", Clock)
+    AnalyticsService.rebuild()
+
+    order_ids = []
+    for _ in range(200):
+        now["value"] += timedelta(hours=rng.randint(0, 20))
+        lines = rng.sample(range(1, 6), rng.randint(1, 3))
+        order = OrderCreate(
+            items=[{"product_id": product_id, "quantity": rng.randint(1, 4)} for product_id in lines],
+            shipping_address="12 MG Road",
+        )
+        order_ids.append(OrderService.create_order(user_id=1, order_data=order)["id"])
+
+        # Walk a few random orders forward, cancelling some on the way
+        for order_id in rng.sample(order_ids, min(3, len(order_ids))):
+            allowed = sorted(ORDER_STATUS_TRANSITIONS[OrderService.get_order_by_id(order_id)["status"]])
+            if allowed:
+                OrderService.update_order_status(order_id, rng.choice(allowed))
+
+    incremental = reports()
+    statuses = incremental["summary"]["orders_by_status"]
+    assert statuses.get("cancelled", 0) > 10 and statuses.get("delivered", 0) > 0
+    assert len(incremental["daily"]) > 50
+
+    AnalyticsService.rebuild()
+    rebuilt = reports()
+    assert rebuilt["summary"] == incremental["summary"]
+    for name in ("products", "categories", "daily"):
+        assert len(rebuilt[name]) == len(incremental[name]), name
+        for expected, actual in zip(rebuilt[name], incremental[name]):
+            assert actual == pytest.approx(expected), name
+
+
+def test_cancelling_the_only_sale_of_a_day_or_product_removes_it(monkeypatch):
+    AnalyticsService.rebuild()
+    order = OrderService.create_order(
+        user_id=1, order_data=OrderCreate(items=[{"product_id": 4, "quantity": 2}], shipping_address="12 MG Road")
+    )
+    assert [row["product_id"] for row in AnalyticsService.get_product_sales()] == [4]
+
+    OrderService.update_order_status(order["id"], "cancelled")
+    incremental = reports()
+    AnalyticsService.rebuild()
+    assert incremental == reports()
+    assert incremental["products"] == incremental["categories"] == incremental["daily"] == []
@@ -0,0 +1,56 @@
+import asyncio
+
+from cart_store import CartStore
+from database import in_memory_storage
+from services.persistence_service import PersistenceService
+
+
+def item(product_id: int, quantity: int = 1) -> dict:
+    return {"product_id": product_id, "quantity": quantity}
+
+
+def spilled_store(tmp_path) -> CartStore:
+    store = CartStore(spill_dir=str(tmp_path / "carts"), memory_budget=10 ** 6)
+    for user_id in range(1, 6):
+        store[user_id] = [item(user_id)]
+    store.sweep(spill_after=0, ttl=3600)  # spill everything
+    store[6] = [item(6)]
+    return store
+
+
+def test_snapshot_view_defers_reading_spilled_carts(tmp_path, monkeypatch):
+    store = spilled_store(tmp_path)
+    reads = []
+    read_spill = store._read_spill
+    monkeypatch.setattr(store, "_read_spill", lambda user_id: reads.append(user_id) or read_spill(user_id))
+
+    view = store.snapshot_view()
+    assert reads == []
+    assert len(view) == 6
+    assert dict(view.items()) == {user_id: [item(user_id)] for user_id in range(1, 7)}
+    assert sorted(reads) == [1, 2, 3, 4, 5]
+    assert store.get_stats()["spilled_carts"] == 5  # nothing was restored
+
+
+def test_snapshot_view_follows_carts_changed_after_it_was_taken(tmp_path):
+    store = spilled_store(tmp_path)
+    view = store.snapshot_view()
+
+    store[1]  # restored into memory, file removed
+    del store[2]
+    store[3] = [item(3, 2)]
+
+    carts = dict(view.items())
+    assert carts[1] == [item(1)]
+    assert 2 not in carts  # the delete is in the mutation log
+    assert carts[3] in ([item(3)], [item(3, 2)])
+    assert carts[4] == [item(4)]
+
+
+def test_background_snapshot_keeps_spilled_carts(tmp_path, persistence, monkeypatch):
+    store = spilled_store(tmp_path)
+    monkeypatch.setitem(in_memory_storage, "cart", store)
+
+    asyncio.run(PersistenceService.snapshot_in_background())
+    state = PersistenceService._load_snapshot()
+    assert state["cart"] == {user_id: [item(user_id)] for user_id in range(1, 7)}
@@ -0,0 +1,111 @@
+import pytest
+
+from catalog import CatalogStore, FrozenProduct
+
+
+def product(product_id: int, stock: int = 10) -> dict:
+    return {"id": product_id, "name": f"Product {product_id}", "stock": stock}
+
+
+def contents(catalog) -> dict:
+    return {product_id: dict(item) for product_id, item in catalog.items()}
+
+
+@pytest.fixture
+def store() -> CatalogStore:
+    store = CatalogStore()
+    store.replace_all({product_id: product(product_id) for product_id in range(1, 101)})
+    return store
+
+
+def test_snapshot_held_across_writes_is_unchanged(store):
+    snapshot = store.current()
+    before = contents(snapshot)
+
+    store[1] = product(1, stock=0)
+    store[500] = product(500)
+    del store[2]
+    store.publish({product_id: product(product_id, stock=1) for product_id in range(3, 90)})
+
+    assert contents(snapshot) == before
+    assert len(snapshot) == 100
+    assert snapshot.get(1)["stock"] == 10
+    assert 500 not in snapshot and 2 in snapshot
+
+
+def test_overlay_delete_hides_base_entry(store):
+    del store[5]
+    snapshot = store.current()
+    assert 5 in snapshot._base and 5 in snapshot._overlay
+    assert 5 not in store
+    assert snapshot.get(5) is None
+    assert store.get(5, "missing") == "missing"
+    assert 5 not in list(snapshot)
+    assert len(snapshot) == 99
+    with pytest.raises(KeyError):
+        store[5]
+    with pytest.raises(KeyError):
+        del store[5]
+
+    store[5] = product(5, stock=3)
+    assert store[5]["stock"] == 3
+    assert len(store) == 100
+
+
+def test_compaction_keeps_content(store):
+    expected = contents(store)
+    compacted = False
+    for round_ in range(200):
+        product_id = round_ % 150 + 1
+        if round_ % 7 == 0 and product_id in expected:
+            del store[product_id]
+            del expected[product_id]
+        else:
+            store[product_id] = product(product_id, stock=round_)
+            expected[product_id] = product(product_id, stock=round_)
+        compacted = compacted or not store.current()._overlay
+        assert contents(store) == expected
+        assert len(store) == len(expected)
+    assert compacted
+    assert len(store.current()._overlay) <= 64
+
+
+def test_published_products_reject_mutation(store):
+    item = store[1]
+    assert isinstance(item, FrozenProduct)
+    for mutate in (
+        lambda: item.__setitem__("stock", 0),
+        lambda: item.__delitem__("stock"),
+        lambda: item.update(stock=0),
+        lambda: item.pop("stock"),
+        lambda: item.popitem(),
+        lambda: item.clear(),
+        lambda: item.setdefault("rating", 5),
+    ):
+        with pytest.raises(TypeError):
+            mutate()
+    with pytest.raises(TypeError):
+        item |= {"stock": 0}
+
+    changed = item.copy()
+    changed["stock"] = 0
+    store[1] = changed
+    assert item["stock"] == 10 and store[1]["stock"] == 0
+
+
+def test_version_increases_on_every_write(store):
+    versions = [store.version]
+    store[1] = product(1, stock=5)
+    versions.append(store.version)
+    del store[1]
+    versions.append(store.version)
+    store.publish({2: product(2, stock=1), 3: None})
+    versions.append(store.version)
+    store.update({4: product(4, stock=2)})
+    versions.append(store.version)
+    store.replace_all({1: product(1)})
+    versions.append(store.version)
+    store.clear()
+    versions.append(store.version)
+    assert versions == sorted(set(versions))
+    assert versions == list(range(versions[0], versions[0] + len(versions)))
@@ -0,0 +1,172 @@
+import gzip
+import json
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from config import settings
+from middleware.compression import CompressionMiddleware, choose_encoding, supported_encodings
+from middleware.response_cache import ResponseCache, ResponseCacheMiddleware, mark_cacheable
+from routers.admission import admit_cache_hit
+from services.admission_service import rate_limiter
+
+BEST = supported_encodings()[0]
+MINIMUM_SIZE = 200
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("", None),
+    ("gzip", "gzip"),
+    ("GZIP;q=0.5", "gzip"),
+    ("identity", None),
+    ("*", BEST),
+    ("*;q=0", None),
+    ("gzip;q=0", None if BEST == "gzip" else "br"),
+    ("gzip;q=0, *;q=0.5", None if BEST == "gzip" else "br"),
+    ("gzip;q=0.2, br;q=0.9", "br" if BEST == "br" else "gzip"),
+    ("gzip;q=oops", None),
+    ("deflate, identity;q=0.5", None),
+])
+def test_choose_encoding(header, expected):
+    assert choose_encoding(header) == expected
+
+
+class Catalog:
+    version = 1
+    renders = 0
+
+
+def make_client() -> TestClient:
+    Catalog.version, Catalog.renders = 1, 0
+    app = FastAPI()
+    cache = ResponseCache(version=lambda: Catalog.version, minimum_size=MINIMUM_SIZE, gzip_level=9)
+    app.add_middleware(ResponseCacheMiddleware, cache=cache, admit=admit_cache_hit)
+    app.add_middleware(CompressionMiddleware, minimum_size=MINIMUM_SIZE)
+
+    @app.get("/catalog")
+    async def catalog(response: Response, size: int = 500):
+        Catalog.renders += 1
+        mark_cacheable(response)
+        response.headers["ETag"] = f'W/"catalog-{Catalog.version}"'
+        response.headers["X-Catalog-Version"] = str(Catalog.version)
+        return {"version": Catalog.version, "padding": "x" * size}
+
+    @app.get("/plain")
+    async def plain(size: int = 500):
+        return {"padding": "x" * size}
+
+    @app.get("/events")
+    async def events():
+        async def stream():
+            for i in range(3):
+                yield f"data: {'x' * 300}{i}\n\n"
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+    @app.get("/export")
+    async def export():
+        async def stream():
+            for i in range(3):
+                yield f"{'y' * 300}{i}\n"
+        return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+    client = TestClient(app)
+    client.cache = cache
+    return client
+
+
+def get(client: TestClient, path: str, encoding: str = "gzip", **headers):
+    return client.get(path, headers={"Accept-Encoding": encoding, **headers})
+
+
+def test_bodies_under_minimum_size_are_not_compressed():
+    client = make_client()
+    small = get(client, "/plain?size=10")
+    assert "content-encoding" not in small.headers
+    large = get(client, "/plain?size=500")
+    assert large.headers["content-encoding"] == "gzip"
+    assert large.headers["vary"] == "Accept-Encoding"
+    assert json.loads(large.content) == {"padding": "x" * 500}
+
+
+def test_identity_only_clients_get_plain_bodies():
+    client = make_client()
+    for encoding in ("identity", "*;q=0"):
+        response = get(client, "/plain", encoding=encoding)
+        assert "content-encoding" not in response.headers
+        assert len(response.content) == int(response.headers["content-length"])
+
+
+def test_event_streams_pass_through_uncompressed():
+    client = make_client()
+    response = get(client, "/events")
+    assert "content-encoding" not in response.headers
+    assert response.text.count("data: ") == 3
+
+
+def test_streamed_bodies_are_compressed_chunk_by_chunk():
+    client = make_client()
+    with client.stream("GET", "/export", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert gzip.decompress(raw).decode().splitlines()[-1] == "y" * 300 + "2"
+
+
+def test_cache_serves_hits_and_compresses_each_variant_once():
+    client = make_client()
+    first = get(client, "/catalog")
+    for _ in range(3):
+        again = get(client, "/catalog")
+        assert again.content == first.content
+        assert again.headers["content-encoding"] == "gzip"
+    plain = get(client, "/catalog", encoding="identity")
+    assert "content-encoding" not in plain.headers
+    assert json.loads(plain.content)["version"] == 1
+
+    assert Catalog.renders == 1
+    stats = client.cache.get_stats()
+    assert stats["hits"] == 4 and stats["misses"] == 1 and stats["compressions"] == 1
+    assert "x-catalog-cacheable" not in first.headers
+
+
+def test_cache_entries_are_invalidated_by_a_catalog_version_change():
+    client = make_client()
+    assert get(client, "/catalog").json()["version"] == 1
+    Catalog.version = 2
+    response = get(client, "/catalog")
+    assert response.json()["version"] == 2
+    assert response.headers["etag"] == 'W/"catalog-2"'
+    assert Catalog.renders == 2
+
+
+def test_revalidation_with_current_etag_gets_304():
+    client = make_client()
+    etag = get(client, "/catalog").headers["etag"]
+
+    response = get(client, "/catalog", **{"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert response.headers["x-catalog-version"] == "1"
+
+    Catalog.version = 2
+    response = get(client, "/catalog", **{"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] == 'W/"catalog-2"'
+
+
+def test_cache_hits_spend_the_read_budget(monkeypatch):
+    client = make_client()
+    monkeypatch.setattr(settings, "admission_enabled", True)
+    monkeypatch.setitem(rate_limiter.budgets, "read", (0.001, 2))
+    monkeypatch.setattr(rate_limiter, "_buckets", type(rate_limiter._buckets)())
+
+    get(client, "/catalog")  # miss: rendered, budgeted by the route in the real app
+    assert get(client, "/catalog").status_code == 200
+    assert get(client, "/catalog").status_code == 200
+    response = get(client, "/catalog")
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+    assert client.cache.get_stats()["hits"] == 2
@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from services.event_hub import EventHub, HubFullError, TooManySubscriptionsError
+
+
+def test_subscriptions_are_capped_per_client():
+    async def scenario():
+        hub = EventHub(max_subscribers=10, max_per_client=2)
+        first = hub.subscribe(["product:1"], client="ip:203.0.113.5")
+        hub.subscribe(["product:2"], client="ip:203.0.113.5")
+        with pytest.raises(TooManySubscriptionsError):
+            hub.subscribe(["product:3"], client="ip:203.0.113.5")
+        hub.subscribe(["product:3"], client="user:7")
+
+        hub.unsubscribe(first)
+        hub.unsubscribe(first)  # unsubscribing twice must not free a second slot
+        hub.subscribe(["product:1"], client="ip:203.0.113.5")
+        with pytest.raises(TooManySubscriptionsError):
+            hub.subscribe(["product:1"], client="ip:203.0.113.5")
+
+        await hub.stop()
+        assert hub.get_stats()["clients"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_overflowed_subscriber_frees_its_slot():
+    async def scenario():
+        hub = EventHub(max_subscribers=10, max_pending=1, max_per_client=1)
+        subscription = hub.subscribe(["product:1", "product:2"], client="user:7")
+        hub.publish(["product:1"], "product:1", "product", {"stock": 1})
+        hub.publish(["product:2"], "product:2", "product", {"stock": 2})
+        assert subscription.overflowed
+        hub.subscribe(["product:1"], client="user:7")
+
+    asyncio.run(scenario())
+
+
+def test_hub_wide_limit_still_applies():
+    async def scenario():
+        hub = EventHub(max_subscribers=1, max_per_client=5)
+        hub.subscribe(["product:1"], client="user:1")
+        with pytest.raises(HubFullError):
+            hub.subscribe(["product:1"], client="user:2")
+
+    asyncio.run(scenario())
+
+
+def test_fan_out_to_a_thousand_subscribers():
+    async def settle():
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+    async def read(subscription, received):
+        while not subscription.closed:
+            received.extend(await subscription.get(timeout=5))
+
+    async def scenario():
+        hub = EventHub(max_subscribers=2000, max_pending=4, max_per_client=5)
+        await hub.start()
+        subscriptions = [
+            hub.subscribe(["product:1", f"product:{2 + i % 10}"], client=f"ip:10.0.{i // 250}.{i % 250}")
+            for i in range(1000)
+        ]
+        readers, slow = subscriptions[:900], subscriptions[900:]
+        received = {subscription: [] for subscription in readers}
+        tasks = [asyncio.create_task(read(subscription, received[subscription])) for subscription in readers]
+        await settle()
+
+        # A burst to one key reaches everyone once, with only the latest state
+        for stock in range(1, 6):
+            hub.publish(["product:1"], "product:1", "product", {"id": 1, "stock": stock})
+        await settle()
+        assert hub.get_stats()["delivered"] == 1000
+        assert hub.get_stats()["coalesced"] == 4000
+        assert all(len(events) == 1 and '"stock": 5' in events[0].data for events in received.values())
+
+        # Only one subscriber in ten watches product:2
+        hub.publish(["product:2"], "product:2", "product", {"id": 2, "stock": 0})
+        await settle()
+        assert sum(len(events) for events in received.values()) == 900 + 90
+
+        # Subscribers that never read overflow and are dropped; readers keep up
+        for key in range(5):
+            hub.publish(["product:1"], f"order:{key}", "order_status", {"id": key})
+            await settle()
+        assert all(subscription.overflowed and subscription.closed for subscription in slow)
+        assert not any(subscription.overflowed for subscription in readers)
+        stats = hub.get_stats()
+        assert stats["dropped"] == 100
+        assert stats["subscribers"] == 900 and stats["clients"] == 900
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for subscription in readers:
+            hub.unsubscribe(subscription)
+        stats = hub.get_stats()
+        assert stats["subscribers"] == stats["clients"] == stats["topics"] == 0
+
+        # Nothing left to deliver to
+        hub.publish(["product:1"], "product:1", "product", {"id": 1, "stock": 6})
+        assert hub.get_stats()["published"] == 11
+
+    asyncio.run(scenario())
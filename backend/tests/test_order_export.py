@@ -0,0 +1,139 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+import services.export_service as export_service
+from config import settings
+from database import in_memory_storage
+from order_index import OrderIndex
+from services.export_service import ExportService
+from services.order_service import OrderService
+
+MIDNIGHT = datetime(2026, 10, 2)
+TIMES = {
+    1: datetime(2026, 10, 1, 0, 0),
+    2: datetime(2026, 10, 1, 23, 59, 59, 999999),
+    3: MIDNIGHT,
+    4: MIDNIGHT,
+    5: datetime(2026, 10, 2, 12, 0),
+    6: datetime(2026, 10, 3, 0, 0),
+    7: datetime(2026, 10, 5, 8, 30),
+}
+
+
+def add_orders():
+    for order_id, created_at in TIMES.items():
+        in_memory_storage["orders"][order_id] = {
+            "id": order_id,
+            "user_id": 1,
+            "items": [{"product_id": 2, "quantity": order_id, "price": 100.0}],
+            "total_amount": 100.0 * order_id,
+            "shipping_address": "12 MG Road, Bengaluru",
+            "status": "delivered" if order_id % 2 else "pending",
+            "created_at": created_at,
+            "updated_at": created_at,
+        }
+    OrderService.rebuild_index()
+
+
+def ids(orders) -> list:
+    return [order["id"] for order in orders]
+
+
+@pytest.fixture
+def index() -> OrderIndex:
+    index = OrderIndex()
+    for order_id, created_at in TIMES.items():
+        index.add(order_id, created_at)
+    return index
+
+
+def test_range_includes_start_and_excludes_end(index):
+    assert list(index.range(MIDNIGHT, datetime(2026, 10, 3))) == [3, 4, 5]
+    assert list(index.range(datetime(2026, 10, 1), MIDNIGHT)) == [1, 2]
+    assert list(index.range(MIDNIGHT, MIDNIGHT)) == []
+    assert list(index.range(MIDNIGHT, MIDNIGHT + timedelta(microseconds=1))) == [3, 4]
+    assert list(index.range(TIMES[2], MIDNIGHT)) == [2]
+
+
+def test_range_open_ends_and_empty_days(index):
+    assert list(index.range()) == list(TIMES)
+    assert list(index.range(end=datetime(2026, 10, 1))) == []
+    assert list(index.range(start=datetime(2026, 10, 3))) == [6, 7]
+    # Days in range with no bucket and bounds on days with no orders
+    assert list(index.range(datetime(2026, 10, 3, 0, 0, 1), datetime(2026, 10, 5))) == []
+    assert list(index.range(datetime(2026, 9, 1), datetime(2026, 11, 1))) == list(TIMES)
+
+
+def test_newest_first_mirrors_oldest_first(index):
+    for start, end in [(None, None), (MIDNIGHT, datetime(2026, 10, 3)), (datetime(2026, 10, 1, 12), None)]:
+        assert list(index.range(start, end, newest_first=True)) == list(index.range(start, end))[::-1]
+
+
+def test_rebuild_matches_incremental_adds(index):
+    rebuilt = OrderIndex()
+    rebuilt.rebuild(reversed(list(TIMES.items())))
+    assert list(rebuilt.range()) == list(index.range())
+    assert len(rebuilt) == len(index) == len(TIMES)
+
+
+def test_iter_orders_converts_offsets_to_utc():
+    add_orders()
+    ist = timezone(timedelta(hours=5, minutes=30))
+    start = datetime(2026, 10, 2, 5, 30, tzinfo=ist)  # midnight UTC
+    end = datetime(2026, 10, 3, 5, 30, tzinfo=ist)
+    assert ids(OrderService.iter_orders(start, end)) == [3, 4, 5]
+    assert ids(OrderService.iter_orders(start, end, status="pending")) == [4]
+
+
+def test_get_all_orders_pages_newest_first():
+    add_orders()
+    assert ids(OrderService.get_all_orders()) == [7, 6, 5, 4, 3, 2, 1]
+    assert ids(OrderService.get_all_orders(skip=2, limit=3)) == [5, 4, 3]
+
+
+@pytest.mark.parametrize("fmt", ["ndjson", "csv"])
+def test_export_chunks_reassemble_to_every_order(monkeypatch, fmt):
+    add_orders()
+    monkeypatch.setattr(export_service, "CHUNK_SIZE", 200)
+    chunks = list(ExportService.export_orders(fmt=fmt))
+
+    assert len(chunks) > 1
+    assert all(len(chunk) >= 200 for chunk in chunks[:-1])
+    body = "".join(chunks)
+    if fmt == "csv":
+        rows = list(csv.DictReader(io.StringIO(body)))
+        assert [int(row["id"]) for row in rows] == list(TIMES)
+        assert rows[0]["created_at"] == TIMES[1].isoformat()
+        assert json.loads(rows[2]["items"])[0]["quantity"] == 3
+        assert rows[1]["items_count"] == "2"
+    else:
+        rows = [json.loads(line) for line in body.splitlines()]
+        assert [row["id"] for row in rows] == list(TIMES)
+        assert rows[1]["created_at"] == TIMES[2].isoformat()
+
+
+def test_export_endpoint_range_parameters(monkeypatch):
+    import main
+
+    add_orders()
+    with TestClient(main.app) as client:
+        response = client.post("/api/v1/auth/register", json={
+            "username": "admin", "email": "admin@example.in", "password": "secret123", "full_name": "Admin",
+        })
+        monkeypatch.setattr(settings, "admin_user_ids", list(in_memory_storage["users"]))
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        def export(**params) -> list:
+            response = client.get("/api/v1/admin/orders/export", params=params, headers=headers)
+            assert response.status_code == 200
+            return [json.loads(line)["id"] for line in response.text.splitlines()]
+
+        assert export(start="2026-10-01", end="2026-10-02") == [1, 2]
+        assert export(start="2026-10-02T00:00:00", end="2026-10-03T00:00:00") == [3, 4, 5]
+        assert export(start="2026-10-02T05:30:00+05:30", end="2026-10-03T05:30:00+05:30") == [3, 4, 5]
+        assert export(start="2026-10-02", status="delivered") == [3, 5, 7]
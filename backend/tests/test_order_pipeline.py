@@ -0,0 +1,66 @@
+import time
+
+from fastapi.testclient import TestClient
+
+from schemas.order import OrderCreate
+from services.order_pipeline import order_queue
+from services.order_service import OrderService
+from services.persistence_service import PersistenceService
+from services.product_service import ProductService
+
+
+def wait_for(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+def test_orders_are_processed_in_every_lifespan():
+    import main
+
+    for run in range(2):
+        with TestClient(main.app) as client:
+            response = client.post("/api/v1/auth/register", json={
+                "username": f"meera{run}", "email": f"meera{run}@example.in",
+                "password": "secret123", "full_name": "Meera",
+            })
+            headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+            order = client.post("/api/v1/orders/", headers=headers, json={
+                "items": [{"product_id": 2, "quantity": 1}], "shipping_address": "12 MG Road",
+            }).json()
+
+            assert wait_for(lambda: OrderService.get_order_by_id(order["id"])["status"] == "confirmed")
+            assert order_queue.get_stats()["workers"] == order_queue.workers
+
+
+def test_restart_resumes_unfinished_orders(persistence):
+    import main
+
+    def place(quantity: int) -> int:
+        order = OrderCreate(items=[{"product_id": 2, "quantity": quantity}], shipping_address="12 MG Road")
+        return OrderService.create_order(user_id=1, order_data=order)["id"]
+
+    PersistenceService.snapshot()
+    pending = place(1)
+    committed = place(2)
+    OrderService.commit_stock(committed)
+    confirmed = place(3)
+    OrderService.commit_stock(confirmed)
+    OrderService.update_order_status(confirmed, "confirmed")
+    cancelled = place(4)
+    OrderService.update_order_status(cancelled, "cancelled")
+
+    # Crash: queued jobs are lost, storage comes back from the log
+    order_queue._queue = None
+    PersistenceService.close(snapshot=False)
+
+    with TestClient(main.app):
+        orders = [OrderService.get_order_by_id(order_id) for order_id in (pending, committed, confirmed)]
+        assert wait_for(lambda: all(order.get("invoice_number") for order in orders))
+        assert [order["status"] for order in orders] == ["confirmed"] * 3
+        assert OrderService.get_order_by_id(cancelled)["status"] == "cancelled"
+        assert "invoice_number" not in OrderService.get_order_by_id(cancelled)
+        assert ProductService.get_product_by_id(2)["stock"] == 15 - 1 - 2 - 3
@@ -0,0 +1,117 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from config import settings
+from schemas.order import OrderCreate
+from services.event_service import EventService
+from services.order_pipeline import OrderPipeline
+from services.order_service import ORDER_STATUS_TRANSITIONS, OrderService
+from services.product_service import ProductService
+
+ALLOWED = {
+    ("pending", "confirmed"),
+    ("pending", "cancelled"),
+    ("confirmed", "processing"),
+    ("confirmed", "cancelled"),
+    ("processing", "shipped"),
+    ("processing", "cancelled"),
+    ("shipped", "delivered"),
+}
+
+
+def place_order(product_id: int = 2, quantity: int = 5) -> dict:
+    order = OrderCreate(items=[{"product_id": product_id, "quantity": quantity}], shipping_address="12 MG Road")
+    return OrderService.create_order(user_id=1, order_data=order)
+
+
+def stock(product_id: int = 2) -> int:
+    return ProductService.get_product_by_id(product_id)["stock"]
+
+
+@pytest.mark.parametrize("current", sorted(ORDER_STATUS_TRANSITIONS))
+@pytest.mark.parametrize("new", sorted(ORDER_STATUS_TRANSITIONS))
+def test_transition_table(current, new):
+    assert OrderService.can_transition(current, new) == ((current, new) in ALLOWED)
+
+
+def test_update_rejects_illegal_and_unknown_status():
+    order = place_order()
+    with pytest.raises(ValueError):
+        OrderService.update_order_status(order["id"], "shipped")
+    with pytest.raises(ValueError):
+        OrderService.update_order_status(order["id"], "lost")
+    assert order["status"] == "pending"
+
+
+@pytest.mark.parametrize("path", [["confirmed"], ["confirmed", "processing"]])
+def test_cancel_after_stock_commit_restocks(path):
+    order = place_order(quantity=5)
+    OrderPipeline.commit_stock(order["id"])
+    assert stock() == 10
+    for status in path:
+        OrderService.update_order_status(order["id"], status)
+
+    OrderService.update_order_status(order["id"], "cancelled")
+    assert stock() == 15
+    assert not order["stock_committed"]
+
+
+def test_pipeline_failure_restocks():
+    order = place_order(quantity=5)
+    OrderPipeline.commit_stock(order["id"])
+    OrderPipeline._fail(order["id"])
+    assert order["status"] == "cancelled"
+    assert stock() == 15
+
+
+def test_cancel_before_stock_commit_leaves_stock():
+    order = place_order(quantity=5)
+    OrderService.update_order_status(order["id"], "cancelled")
+    assert stock() == 15
+
+
+def test_short_stock_cancels_without_restock():
+    order = place_order(quantity=16)
+    OrderPipeline.commit_stock(order["id"])
+    assert order["status"] == "cancelled"
+    assert stock() == 15
+
+
+def test_retried_stock_commit_takes_stock_once(monkeypatch):
+    order = place_order(quantity=5)
+    publish = EventService.publish_product_change
+    calls = []
+
+    def fail_first(product):
+        calls.append(product["id"])
+        if len(calls) == 1:
+            raise RuntimeError("event hub unavailable")
+        publish(product)
+
+    monkeypatch.setattr(EventService, "publish_product_change", fail_first)
+    with pytest.raises(RuntimeError):
+        OrderPipeline.commit_stock(order["id"])
+    OrderPipeline.commit_stock(order["id"])
+    assert stock() == 10
+    assert order["stock_committed"]
+
+
+def test_customer_may_only_cancel(monkeypatch):
+    import main
+
+    monkeypatch.setattr(settings, "admin_user_ids", [])
+    with TestClient(main.app) as client:
+        response = client.post("/api/v1/auth/register", json={
+            "username": "asha", "email": "asha@example.in", "password": "secret123", "full_name": "Asha",
+        })
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        order = client.post("/api/v1/orders/", headers=headers, json={
+            "items": [{"product_id": 2, "quantity": 5}], "shipping_address": "12 MG Road",
+        }).json()
+
+        for status in ("confirmed", "processing", "shipped", "delivered"):
+            response = client.put(f"/api/v1/orders/{order['id']}/status", params={"status": status}, headers=headers)
+            assert response.status_code == 403
+        response = client.put(f"/api/v1/orders/{order['id']}/status", params={"status": "cancelled"}, headers=headers)
+        assert response.status_code == 200
+    assert stock() == 15
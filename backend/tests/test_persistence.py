@@ -0,0 +1,122 @@
+import copy
+import os
+
+import pytest
+
+from database import in_memory_storage
+from services.persistence_service import (
+    LOG_FILE, RECORD_HEADER, ROTATED_LOG_FILE, PersistenceService
+)
+
+
+def put_user(user_id: int, name: str):
+    user = {"id": user_id, "full_name": name}
+    in_memory_storage["users"][user_id] = user
+    PersistenceService.record_put("users", user_id, user)
+
+
+def restart() -> dict:
+    """Drop the in-memory users and load them back from disk"""
+    PersistenceService.close(snapshot=False)
+    in_memory_storage["users"].clear()
+    assert PersistenceService.load()
+    return dict(in_memory_storage["users"])
+
+
+def test_snapshot_plus_log_tail_round_trip(persistence):
+    put_user(1, "Asha")
+    put_user(2, "Ravi")
+    PersistenceService.snapshot()
+    put_user(2, "Ravi Kumar")
+    put_user(3, "Meera")
+    del in_memory_storage["users"][1]
+    PersistenceService.record_delete("users", 1)
+
+    users = copy.deepcopy(dict(in_memory_storage["users"]))
+    products = {product_id: dict(product) for product_id, product in in_memory_storage["products"].items()}
+    in_memory_storage["products"].replace_all({})
+
+    assert restart() == users
+    assert {product_id: dict(product) for product_id, product in in_memory_storage["products"].items()} == products
+
+
+@pytest.mark.parametrize("damage", ["torn", "bad_crc"])
+def test_damaged_tail_record_is_dropped(persistence, damage):
+    PersistenceService.snapshot()
+    put_user(1, "Asha")
+    put_user(2, "Ravi")
+    log_path = persistence / LOG_FILE
+    intact = os.path.getsize(log_path)
+    put_user(3, "Meera")
+    PersistenceService.close(snapshot=False)
+
+    with open(log_path, "r+b") as f:
+        if damage == "torn":
+            f.truncate(intact + RECORD_HEADER.size + 3)
+        else:
+            f.seek(-1, os.SEEK_END)
+            last = f.read(1)
+            f.seek(-1, os.SEEK_END)
+            f.write(bytes([last[0] ^ 0xFF]))
+
+    assert set(restart()) == {1, 2}
+    assert os.path.getsize(log_path) == intact
+
+    # New records land after the last good one and are replayed
+    put_user(4, "Kiran")
+    assert set(restart()) == {1, 2, 4}
+
+
+def test_rotated_log_of_an_interrupted_snapshot_is_replayed(persistence):
+    PersistenceService.snapshot()
+    put_user(1, "Asha")
+    put_user(2, "Ravi")
+    # A background snapshot rotated the log and then the process died
+    PersistenceService._rotate_log()
+    put_user(2, "Ravi Kumar")
+    put_user(3, "Meera")
+    PersistenceService.close(snapshot=False)
+    assert os.path.exists(persistence / ROTATED_LOG_FILE)
+
+    users = restart()
+    assert users == {
+        1: {"id": 1, "full_name": "Asha"},
+        2: {"id": 2, "full_name": "Ravi Kumar"},
+        3: {"id": 3, "full_name": "Meera"},
+    }
+
+
+def test_rotating_again_keeps_the_older_rotated_records_first(persistence):
+    PersistenceService.snapshot()
+    put_user(1, "Asha")
+    PersistenceService._rotate_log()
+    put_user(1, "Asha Rao")
+    PersistenceService._rotate_log()  # the earlier snapshot failed
+    put_user(2, "Ravi")
+
+    assert restart() == {1: {"id": 1, "full_name": "Asha Rao"}, 2: {"id": 2, "full_name": "Ravi"}}
+
+
+def test_snapshot_write_is_retried_on_runtime_error(persistence, monkeypatch):
+    write_snapshot = PersistenceService._write_snapshot
+    attempts = []
+
+    def flaky(state):
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise RuntimeError("dictionary changed size during iteration")
+        write_snapshot(state)
+
+    monkeypatch.setattr(PersistenceService, "_write_snapshot", staticmethod(flaky))
+    PersistenceService._write_snapshot_from({"users": {1: {"id": 1}}})
+    assert len(attempts) == 3
+    assert PersistenceService._load_snapshot() == {"users": {1: {"id": 1}}}
+
+
+def test_snapshot_write_gives_up_after_three_attempts(persistence, monkeypatch):
+    def always_fails(state):
+        raise RuntimeError("dictionary changed size during iteration")
+
+    monkeypatch.setattr(PersistenceService, "_write_snapshot", staticmethod(always_fails))
+    with pytest.raises(RuntimeError):
+        PersistenceService._write_snapshot_from({"users": {}})
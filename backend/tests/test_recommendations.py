@@ -0,0 +1,37 @@
+from schemas.order import OrderCreate
+from services import recommendation_service
+from services.order_pipeline import OrderPipeline
+from services.order_service import OrderService
+from services.recommendation_service import RecommendationService
+
+
+def place_order(product_ids, quantity: int = 1) -> dict:
+    order = OrderCreate(
+        items=[{"product_id": product_id, "quantity": quantity} for product_id in product_ids],
+        shipping_address="12 MG Road",
+    )
+    return OrderService.create_order(user_id=1, order_data=order)
+
+
+def snapshot():
+    return (
+        {product_id: dict(row) for product_id, row in recommendation_service._cooccurrence.items()},
+        dict(recommendation_service._neighbors),
+    )
+
+
+def test_cancelled_orders_match_rebuild():
+    RecommendationService.rebuild()
+    place_order([1, 3, 5])
+    place_order([1, 3])
+    short = place_order([1, 2], quantity=16)  # more than product 2's stock
+    cancelled = place_order([3, 4])
+    OrderPipeline.commit_stock(short["id"])
+    OrderService.update_order_status(cancelled["id"], "cancelled")
+    assert short["status"] == "cancelled"
+
+    incremental = snapshot()
+    RecommendationService.rebuild()
+    assert incremental == snapshot()
+    assert 2 not in incremental[0]
+    assert [product["id"] for product in RecommendationService.get_related_products(1)] == [3, 5]
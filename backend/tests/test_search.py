@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from config import settings
+from services.search_service import SearchService, fold, trigrams
+
+
+def dice(a: str, b: str) -> float:
+    a, b = trigrams(a), trigrams(b)
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+@pytest.fixture(autouse=True)
+def index():
+    SearchService.rebuild()
+    yield
+    SearchService.rebuild()
+
+
+@pytest.mark.parametrize("variants", [
+    ("kanjeevaram", "kanjivaram", "kanjiivaram"),
+    ("shree", "sri", "shri"),
+    ("bhindi", "bindi"),
+    ("zari", "jari"),
+    ("diwali", "divali"),
+    ("kaaju", "kaju"),
+    ("dhoop", "dup"),
+])
+def test_fold_unifies_transliterations(variants):
+    assert len({fold(variant) for variant in variants}) == 1
+
+
+@pytest.mark.parametrize("query", ["kanjeevaram", "kanjivaram", "Kancheepuram saree", "kanjivaram sari"])
+def test_transliterations_and_synonyms_find_the_saree(query):
+    assert SearchService.search(query)[0] == 2
+
+
+@pytest.mark.parametrize("query", ["haldi", "turmeric", "haldi powder", "tumeric"])
+def test_haldi_and_turmeric_find_the_same_product(query):
+    assert SearchService.search(query)[0] == 3
+
+
+def test_words_below_the_similarity_threshold_do_not_match():
+    # "basmati" is a token of product 1; "batik" shares too few trigrams
+    assert dice(fold("batik"), fold("basmati")) < settings.search_min_similarity
+    assert SearchService.search("batik") == []
+    assert SearchService.search("xylophone") == []
+
+    # A typo close enough still matches
+    assert dice(fold("basmatti"), fold("basmati")) >= settings.search_min_similarity
+    assert SearchService.search("basmatti") == [1]
+
+
+def test_products_matching_every_word_rank_before_partial_matches():
+    results = SearchService.search("brass turmeric")
+    assert set(results) == {3, 4}
+    assert SearchService.search("brass diya") == [4]
+
+
+def test_synonyms_file_adds_groups(tmp_path, monkeypatch):
+    path = tmp_path / "synonyms.json"
+    path.write_text(json.dumps([["pooja thali", "lamp"]]))
+    monkeypatch.setattr(settings, "search_synonyms_file", str(path))
+    SearchService.rebuild()
+    assert SearchService.search("thali")[0] == 4
+
+
+@pytest.mark.parametrize("content", [
+    '[["haldi", "turmeric"]',
+    '{"haldi": "turmeric"}',
+    '["haldi", "turmeric"]',
+    '[["haldi", 7]]',
+])
+def test_malformed_synonyms_file_is_rejected(tmp_path, monkeypatch, content):
+    path = tmp_path / "synonyms.json"
+    path.write_text(content)
+    monkeypatch.setattr(settings, "search_synonyms_file", str(path))
+    with pytest.raises(ValueError, match="synonyms.json"):
+        SearchService.rebuild()
@@ -0,0 +1,24 @@
+from fastapi.testclient import TestClient
+
+from config import settings
+from services.product_service import ProductService
+from services.suggest_service import SuggestService
+
+
+def test_popular_query_reaches_suggestions_without_catalog_change():
+    import main
+
+    query = "zardozi clutch"
+    with TestClient(main.app) as client:
+        version = ProductService.get_catalog_version()
+        response = client.get("/api/v1/products/suggest", params={"q": "zardozi"})
+        assert response.status_code == 200
+        assert "ETag" not in response.headers
+        assert f"max-age={settings.suggest_cache_max_age}" in response.headers["Cache-Control"]
+        assert query not in [s["text"] for s in response.json()]
+
+        for _ in range(settings.suggest_query_min_count):
+            SuggestService.record_query(query)
+        response = client.get("/api/v1/products/suggest", params={"q": "zardozi"})
+        assert ProductService.get_catalog_version() == version
+        assert query in [s["text"] for s in response.json() if s["type"] == "query"]
@@ -1,5 +1,6 @@
 import React, { createContext, useContext, useState, useEffect } from 'react';
 import { api } from '../services/api';
+import { useBootstrap } from '../hooks/useBootstrap';
 
 const AuthContext = createContext();
 
@@ -15,27 +16,27 @@ export const AuthProvider = ({ children }) => {
   const [user, setUser] = useState(null);
   const [token, setToken] = useState(localStorage.getItem('token'));
   const [loading, setLoading] = useState(true);
+  // The profile comes from /bootstrap rather than a separate /auth/me call
+  const bootstrap = useBootstrap(token);
 
   useEffect(() => {
     if (token) {
       api.defaults.headers.common['Authorization'] = `Bearer ${token}`;
-      fetchProfile();
     } else {
       setLoading(false);
     }
   }, [token]);
 
-  const fetchProfile = async () => {
-    try {
-      const response = await api.get('/auth/me');
-      setUser(response.data);
-    } catch (error) {
-      console.error('Failed to fetch profile:', error);
+  useEffect(() => {
+    if (!token || bootstrap.isLoading) return;
+    if (bootstrap.data?.user) {
+      setUser(bootstrap.data.user);
+    } else {
+      console.error('Failed to fetch profile:', bootstrap.error);
       logout();
-    } finally {
-      setLoading(false);
     }
-  };
+    setLoading(false);
+  }, [token, bootstrap.data, bootstrap.error, bootstrap.isLoading]);
 
   const login = async (email, password) => {
     try {
@@ -86,6 +87,7 @@ export const AuthProvider = ({ children }) => {
     user,
     token,
     loading,
+    cartSummary: token ? bootstrap.data?.cart : null,
     login,
     register,
     logout,
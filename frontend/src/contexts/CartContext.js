@@ -15,25 +15,35 @@ export const useCart = () => {
 
 export const CartProvider = ({ children }) => {
   const [cartItems, setCartItems] = useState([]);
+  const [cartLoaded, setCartLoaded] = useState(false);
   const [loading, setLoading] = useState(false);
-  const { isAuthenticated } = useAuth();
+  const [cartError, setCartError] = useState(null);
+  // Until the full cart is needed, counts come from the bootstrap summary
+  const { isAuthenticated, cartSummary } = useAuth();
 
   const fetchCart = async () => {
     if (!isAuthenticated) return;
     
     try {
       setLoading(true);
+      setCartError(null);
       const response = await api.get('/cart');
       setCartItems(response.data);
+      setCartLoaded(true);
     } catch (error) {
       console.error('Failed to fetch cart:', error);
+      setCartError(error);
     } finally {
       setLoading(false);
     }
   };
 
   useEffect(() => {
-    fetchCart();
+    if (!isAuthenticated) {
+      setCartItems([]);
+      setCartLoaded(false);
+      setCartError(null);
+    }
   }, [isAuthenticated]);
 
   const addToCart = async (productId, quantity = 1) => {
@@ -64,21 +74,26 @@ export const CartProvider = ({ children }) => {
   };
 
   const getCartTotal = () => {
+    if (!cartLoaded) return cartSummary?.total_amount || 0;
     return cartItems.reduce((total, item) => {
       return total + (item.product.price * item.quantity);
     }, 0);
   };
 
   const getCartItemsCount = () => {
+    if (!cartLoaded) return cartSummary?.total_items || 0;
     return cartItems.reduce((count, item) => count + item.quantity, 0);
   };
 
   const clearCart = () => {
     setCartItems([]);
+    setCartLoaded(true);
   };
 
   const value = {
     cartItems,
+    cartLoaded,
+    cartError,
     loading,
     addToCart,
     removeFromCart,
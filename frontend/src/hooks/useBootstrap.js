@@ -0,0 +1,13 @@
+import { useQuery } from 'react-query';
+import { api } from '../services/api';
+
+// Featured products, the signed-in user and their cart summary in one round
+// trip. The auth and cart contexts and the home page share this query (keyed
+// by token), so they make a single request between them. The trailing slash
+// matches the route and avoids a redirect round trip.
+export const useBootstrap = (token) =>
+  useQuery(
+    ['bootstrap', token],
+    () => api.get('/bootstrap/', { params: { fields: 'featured,user,cart' } }).then(res => res.data),
+    { staleTime: 60 * 1000 }
+  );
@@ -1,4 +1,4 @@
-import React from 'react';
+import React, { useEffect } from 'react';
 import { Link, useNavigate } from 'react-router-dom';
 import { useCart } from '../contexts/CartContext';
 import { useAuth } from '../contexts/AuthContext';
@@ -8,10 +8,17 @@ import { api } from '../services/api';
 import toast from 'react-hot-toast';
 
 const Cart = () => {
-  const { cartItems, removeFromCart, getCartTotal, loading } = useCart();
+  const { cartItems, cartLoaded, cartError, fetchCart, removeFromCart, getCartTotal, loading } = useCart();
   const { isAuthenticated } = useAuth();
   const navigate = useNavigate();
 
+  // The rest of the app only needs the cart summary; load the items here
+  useEffect(() => {
+    if (isAuthenticated && !cartLoaded && !cartError) {
+      fetchCart();
+    }
+  }, [isAuthenticated, cartLoaded]);
+
   const { data: user } = useQuery(
     'profile',
     () => api.get('/profile').then(res => res.data),
@@ -67,7 +74,7 @@ const Cart = () => {
     }).format(price);
   };
 
-  if (loading) {
+  if (loading || (isAuthenticated && !cartLoaded && !cartError)) {
     return (
       <div className="min-h-screen flex items-center justify-center">
         <div className="animate-spin rounded-full h-32 w-32 border-b-2 border-primary-500"></div>
@@ -75,6 +82,24 @@ const Cart = () => {
     );
   }
 
+  if (isAuthenticated && cartError) {
+    return (
+      <div className="min-h-screen flex items-center justify-center">
+        <div className="text-center">
+          <ShoppingBag className="h-16 w-16 text-gray-400 mx-auto mb-4" />
+          <h2 className="text-2xl font-bold text-gray-900 mb-4">Couldn't load your cart</h2>
+          <p className="text-gray-600 mb-6">Check your connection and try again</p>
+          <button
+            onClick={fetchCart}
+            className="bg-primary-500 text-white px-6 py-3 rounded-lg hover:bg-primary-600 transition-colors"
+          >
+            Retry
+          </button>
+        </div>
+      </div>
+    );
+  }
+
   if (!isAuthenticated) {
     return (
       <div className="min-h-screen flex items-center justify-center">
@@ -1,24 +1,16 @@
-import React, { useState, useEffect } from 'react';
+import React from 'react';
 import { Link } from 'react-router-dom';
-import { useQuery } from 'react-query';
 import { ArrowRight, Star, Truck, Shield, RotateCcw, Headphones } from 'lucide-react';
-import { api } from '../services/api';
+import { useAuth } from '../contexts/AuthContext';
+import { useBootstrap } from '../hooks/useBootstrap';
 import ProductCard from '../components/ProductCard';
 
 const Home = () => {
-  const [featuredProducts, setFeaturedProducts] = useState([]);
-
-  const { data: categories } = useQuery('categories', () => api.get('/categories').then(res => res.data));
-
-  useEffect(() => {
-    // Fetch featured products (top rated)
-    api.get('/products')
-      .then(res => {
-        const products = res.data.sort((a, b) => b.rating - a.rating).slice(0, 8);
-        setFeaturedProducts(products);
-      })
-      .catch(err => console.error('Failed to fetch featured products:', err));
-  }, []);
+  // Shared with the auth and cart contexts, so the page costs no extra
+  // request; featured products are cached server-side per catalog version
+  const { token } = useAuth();
+  const { data: bootstrap } = useBootstrap(token);
+  const featuredProducts = bootstrap?.featured || [];
 
   const features = [
     {